@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from srs_algorithm import SRSAlgorithm
 from db_init import init_database, check_database_health, detect_db_type
 from database_adapter import db_adapter
+from session_answers import validate_bulk_answers, save_answers_bulk
 from database_resilience import get_resilient_connection, get_connection_status
 
 # Baris 1-15: Imports and app initialization
@@ -868,24 +869,33 @@ def health_check():
         cursor.execute('SELECT 1')
         conn.close()
 
-        return jsonify({
+        # HEAD probe hanya butuh status code: lewati serialisasi JSON
+        if request.method == 'HEAD':
+            return '', 200, {'Cache-Control': 'no-store'}
+
+        response = jsonify({
             'status': 'healthy',
             'database': db_status,
             'db_path': DATABASE,
             'timestamp': datetime.now().isoformat(),
             'environment': 'railway' if os.environ.get('RAILWAY_ENVIRONMENT') else 'local'
         })
+        # Jangan sampai cache di depan app menyembunyikan kegagalan
+        response.headers['Cache-Control'] = 'no-store'
+        return response
     except Exception as e:
         logger.error(f"Health check failed: {e}", exc_info=True)
         # Get database resilience status even on failure
         db_status = get_connection_status()
-        return jsonify({
+        response = jsonify({
             'status': 'unhealthy',
             'error': str(e),
             'database': db_status,
             'db_path': DATABASE,
             'timestamp': datetime.now().isoformat()
-        }), 500
+        })
+        response.headers['Cache-Control'] = 'no-store'
+        return response, 500
 
 
 
@@ -2832,6 +2842,50 @@ def session_answer():
         conn.close()
         logger.info(f"🔌 Database connection closed")
 
+@app.route('/api/session/answers/bulk', methods=['POST'])
+def session_answers_bulk():
+    """Simpan semua jawaban satu sesi dengan satu request dan satu executemany"""
+    data = request.get_json()
+
+    # VALIDASI DATA
+    error = validate_bulk_answers(data)
+    if error:
+        logger.error(f"❌ Invalid bulk answers: {error}")
+        return jsonify({"error": error}), 400
+
+    session_token = data['session_token']
+    conn = get_db()
+    cursor = conn.cursor()
+
+    try:
+        # CEK session_token dan word_id, lalu satu executemany
+        count, error = save_answers_bulk(cursor, session_token, data['answers'])
+        if error:
+            logger.error(f"❌ {error} in bulk answers for session {session_token}")
+            return jsonify({"error": error}), 400
+
+        conn.commit()
+        logger.info(f"🎯 {count} answers saved for session {session_token}")
+
+        return jsonify({
+            "status": "answers_saved",
+            "count": count
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error during bulk answer insertion: {str(e)}", exc_info=True)
+        try:
+            conn.rollback()
+        except Exception as rollback_error:
+            logger.error(f"❌ Failed to rollback transaction: {rollback_error}")
+        return jsonify({
+            "error": "Database insertion failed",
+            "error_type": type(e).__name__,
+            "details": str(e)
+        }), 500
+    finally:
+        conn.close()
+
 if __name__ == '__main__':
     try:
         import os
@@ -5,11 +5,28 @@ Supports both SQLite (local development) and PostgreSQL (Railway production)
 
 import os
 import logging
+from functools import lru_cache
 from typing import Any, List, Tuple, Optional
 from database_resilience import get_resilient_connection
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _sqlite_to_postgres(sql: str) -> str:
+    """
+    Convert SQLite syntax to PostgreSQL. The app only issues a fixed set of
+    SQL strings, so each one is rewritten once and then served from the cache.
+    """
+    sql = sql.replace('AUTOINCREMENT', 'SERIAL')
+    sql = sql.replace('CURRENT_TIMESTAMP', 'NOW()')
+    sql = sql.replace('?', '%s')
+    # Handle boolean conversions in INSERT/UPDATE
+    sql = sql.replace('TRUE', 'true')
+    sql = sql.replace('FALSE', 'false')
+    # Handle datetime functions
+    sql = sql.replace("datetime('now')", 'NOW()')
+    return sql
+
 class DatabaseAdapter:
     """
     Database abstraction layer that handles differences between SQLite and PostgreSQL
@@ -49,15 +66,7 @@ class DatabaseAdapter:
         Adapt SQL syntax for the current database type
         """
         if self.is_postgresql:
-            # Convert SQLite syntax to PostgreSQL
-            sql = sql.replace('AUTOINCREMENT', 'SERIAL')
-            sql = sql.replace('CURRENT_TIMESTAMP', 'NOW()')
-            sql = sql.replace('?', '%s')
-            # Handle boolean conversions in INSERT/UPDATE
-            sql = sql.replace('TRUE', 'true')
-            sql = sql.replace('FALSE', 'false')
-            # Handle datetime functions
-            sql = sql.replace("datetime('now')", 'NOW()')
+            sql = _sqlite_to_postgres(sql)
         return sql
 
     def adapt_params(self, params: Tuple) -> Tuple:
@@ -131,7 +140,7 @@ class DatabaseAdapter:
             self._connection.connection.commit()
         else:
             # SQLite cursor is the connection
-            self._connection.connection.commit()
+            self._connection.commit()
 
     def close(self):
         """Close database connection"""
@@ -139,7 +148,7 @@ class DatabaseAdapter:
             if hasattr(self._connection, 'connection'):
                 self._connection.connection.close()
             else:
-                self._connection.connection.close()
+                self._connection.close()
             self._connection = None
 
     def get_db_type(self) -> str:
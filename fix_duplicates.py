@@ -3,24 +3,38 @@
 Script to fix duplicate endpoint functions in app.py
 """
 
-import re
+import ast
+
+def is_app_route(decorator):
+    """True for @app.route(...) decorators"""
+    func = decorator.func if isinstance(decorator, ast.Call) else decorator
+    return (isinstance(func, ast.Attribute) and func.attr == 'route'
+            and isinstance(func.value, ast.Name) and func.value.id == 'app')
 
 def fix_duplicates():
     # Read the file
     with open('app.py', 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Find all get_next_word function definitions
-    pattern = r'@app\.route\([^)]+\)\s*\n\s*def get_next_word\(\):.*?(?=\n\s*@app\.route|\n\s*def [a-zA-Z_]|$)'
-    matches = re.findall(pattern, content, re.DOTALL)
+    # Find all top-level @app.route get_next_word definitions with one parse
+    tree = ast.parse(content)
+    spans = [
+        (min(d.lineno for d in node.decorator_list), node.end_lineno)
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name == 'get_next_word'
+        and any(is_app_route(d) for d in node.decorator_list)
+    ]
 
-    print(f"Found {len(matches)} get_next_word functions")
+    print(f"Found {len(spans)} get_next_word functions")
 
-    if len(matches) > 1:
+    if len(spans) > 1:
         # Keep the last one (most complete implementation)
-        # Remove all but the last occurrence
-        for i in range(len(matches) - 1):
-            content = content.replace(matches[i], '', 1)
+        # Copy every line outside the earlier definitions
+        lines = content.splitlines(keepends=True)
+        removed = set()
+        for start, end in spans[:-1]:
+            removed.update(range(start - 1, end))
+        content = ''.join(line for i, line in enumerate(lines) if i not in removed)
 
     # Write back
     with open('app.py', 'w', encoding='utf-8') as f:
@@ -3,62 +3,77 @@
 Script to fix SQL placeholder mismatches between SQLite (?) and PostgreSQL (%s)
 """
 
+import io
 import os
-import re
-import glob
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+
+# Tokens that carry no code and may sit between call parts
+_SKIP_TOKENS = (tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT,
+                tokenize.INDENT, tokenize.DEDENT)
+
+# Directories that never contain project sources
+_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', '.venv'}
+
+def _find_sql_literals(content):
+    """
+    Yield (start, end) offsets of the SQL string literal passed as the first
+    argument of every cursor.execute(...) call that still uses ? placeholders.
+
+    Single linear pass over Python tokens: comments, docstrings and calls
+    that were already converted (literal followed by `if`) are skipped.
+    """
+    line_offsets = [0]
+    for line in content.splitlines(keepends=True):
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    def offset(pos):
+        row, col = pos
+        return line_offsets[row - 1] + col
+
+    tokens = [tok for tok in tokenize.generate_tokens(io.StringIO(content).readline)
+              if tok.type not in _SKIP_TOKENS]
+
+    for i in range(len(tokens) - 4):
+        if not (tokens[i].type == tokenize.NAME and tokens[i].string == 'cursor'
+                and tokens[i + 1].string == '.' and tokens[i + 2].string == 'execute'
+                and tokens[i + 3].string == '('):
+            continue
+
+        # Collect the (possibly implicitly concatenated) string literal
+        j = i + 4
+        while j < len(tokens) and tokens[j].type == tokenize.STRING:
+            j += 1
+        if j == i + 4 or j >= len(tokens) or tokens[j].string != ',':
+            continue
+
+        literals = tokens[i + 4:j]
+        if any('?' in tok.string for tok in literals):
+            yield offset(literals[0].start), offset(literals[-1].end)
 
 def fix_sql_placeholders_in_file(filepath):
     """Fix SQL placeholders in a single file"""
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    original_content = content
-
-    # Pattern to find cursor.execute calls with ? placeholders
-    # This is a complex regex to match various SQL execute patterns
-    patterns = [
-        # cursor.execute('SELECT ... WHERE ... = ?', (param,))
-        (r"cursor\.execute\(\s*'''([\s\S]*?)\?([\s\S]*?)'''\s*,\s*\(([^)]+)\)\s*\)",
-         r"cursor.execute('''\1%s\2''' if db_adapter.is_postgresql else '''\1?\2''', (\3))"),
-
-        # cursor.execute("SELECT ... WHERE ... = ?", (param,))
-        (r'cursor\.execute\(\s*"""([\s\S]*?)\?([\s\S]*?)"""\s*,\s*\(([^)]+)\)\s*\)',
-         r'cursor.execute("""\1%s\2""" if db_adapter.is_postgresql else """\1?\2""", (\3))'),
-
-        # cursor.execute('SELECT ... WHERE ... = ?', (param,))
-        (r"cursor\.execute\(\s*'([\s\S]*?)\?([\s\S]*?)'\s*,\s*\(([^)]+)\)\s*\)",
-         r"cursor.execute('\1%s\2' if db_adapter.is_postgresql else '\1?\2', (\3))"),
-
-        # cursor.execute("SELECT ... WHERE ... = ?", (param,))
-        (r'cursor\.execute\(\s*"([\s\S]*?)\?([\s\S]*?)"\s*,\s*\(([^)]+)\)\s*\)',
-         r'cursor.execute("\1%s\2" if db_adapter.is_postgresql else "\1?\2", (\3))'),
-    ]
-
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-
-    # Also fix multi-parameter queries
-    # Pattern for multiple ? placeholders
-    def replace_placeholders(match):
-        sql = match.group(1)
-        params = match.group(2)
-
-        # Count ? in SQL
-        question_marks = sql.count('?')
-        if question_marks > 1:
-            # Replace all ? with %s for PostgreSQL, keep ? for SQLite
-            pg_sql = sql.replace('?', '%s')
-            return f"cursor.execute('''{pg_sql}''' if db_adapter.is_postgresql else '''{sql}''', {params})"
-        else:
-            # Single parameter case
-            pg_sql = sql.replace('?', '%s')
-            return f"cursor.execute('''{pg_sql}''' if db_adapter.is_postgresql else '''{sql}''', {params})"
-
-    # More complex pattern for multi-param queries
-    complex_pattern = r"cursor\.execute\(\s*'''([\s\S]*?)'''\s*,\s*(\([^)]+\))\s*\)"
-    content = re.sub(complex_pattern, replace_placeholders, content, flags=re.MULTILINE | re.DOTALL)
-
-    if content != original_content:
+    # Cheap substring checks first: most files have no SQL to convert
+    if 'cursor.execute' not in content or '?' not in content:
+        print(f"ℹ️  No changes needed for {filepath}")
+        return False
+
+    # Build the new file in one pass from the untouched gaps and the rewritten literals
+    spans = list(_find_sql_literals(content))
+    parts = []
+    last = 0
+    for start, end in spans:
+        sql = content[start:end]
+        parts.append(content[last:start])
+        parts.append(f"{sql.replace('?', '%s')} if db_adapter.is_postgresql else {sql}")
+        last = end
+    parts.append(content[last:])
+    content = ''.join(parts)
+
+    if spans:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
         print(f"✅ Fixed {filepath}")
@@ -67,23 +82,37 @@ def fix_sql_placeholders_in_file(filepath):
         print(f"ℹ️  No changes needed for {filepath}")
         return False
 
+def find_python_files(root='.'):
+    """Collect every .py file under root in a single directory walk"""
+    python_files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+        python_files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith('.py'))
+    return python_files
+
+def _fix_file(filepath):
+    """Worker wrapper: report errors instead of raising across processes"""
+    try:
+        return fix_sql_placeholders_in_file(filepath), None
+    except Exception as e:
+        return False, e
+
 def main():
     """Fix SQL placeholders in all Python files"""
     print("🔧 Fixing SQL placeholder mismatches...")
 
-    # Find all Python files
-    python_files = glob.glob('*.py') + glob.glob('frontend/**/*.py')
+    # Find all Python files, skipping this script itself
+    python_files = [f for f in find_python_files()
+                    if os.path.basename(f) != 'fix_sql_placeholders.py']
 
+    # Files are independent, so spread them across CPU cores
     fixed_count = 0
-    for filepath in python_files:
-        if 'fix_sql_placeholders.py' in filepath:
-            continue  # Skip this script itself
-
-        try:
-            if fix_sql_placeholders_in_file(filepath):
+    with ProcessPoolExecutor() as executor:
+        for filepath, (fixed, error) in zip(python_files, executor.map(_fix_file, python_files)):
+            if error is not None:
+                print(f"❌ Error fixing {filepath}: {error}")
+            elif fixed:
                 fixed_count += 1
-        except Exception as e:
-            print(f"❌ Error fixing {filepath}: {e}")
 
     print(f"\n🎉 Fixed {fixed_count} files")
     print("\n📝 Summary of changes:")
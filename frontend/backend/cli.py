@@ -1,14 +1,57 @@
 import sqlite3
+import sys
+import itertools
 from datetime import date
 from review_scheduler import SRSAlgorithm, load_due_vocabulary, simulate_learning_curve
 from visualization import plot_review_schedule, plot_retention_curve, generate_report
 from database_adapter import db_adapter
+from config import DATABASE
+from db import RS_INDEXES, SCHEMA_VERSION, get_conn, migrate
 
-DATABASE = "vocabulary_app.db"
+# Kosakata dari menu ditampung dulu lalu ditulis sekaligus
+VOCAB_BUFFER_SIZE = 10
+# Batas parameter SQLite lama adalah 999, satu baris vocabulary memakai 5
+_VOCAB_ROWS_PER_INSERT = 999 // 5
+_vocab_buffer = []
+# Di atas jumlah baris ini bulk_record_reviews membuang index sekunder review_sessions lalu
+# membangunnya ulang sekali; untuk impor kecil memperbarui index per baris lebih murah
+BULK_REINDEX_MIN_ROWS = 10000
+
+# Satu koneksi dipakai ulang oleh semua fungsi CLI
+_CONN = None
+
+# SQL ditulis sekali di sini; sqlite3 meng-cache statement per koneksi
+# sehingga string yang sama tidak di-parse ulang pada koneksi yang dipakai ulang
+_SQL_INSERT_USER = "INSERT INTO users (username, created_date) VALUES (?, ?)"
+_SQL_SELECT_USER = "SELECT id FROM users WHERE username = ?"
+_SQL_INSERT_VOCAB_PREFIX = 'INSERT INTO vocabulary (english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score) VALUES '
+_SQL_INSERT_VOCAB = _SQL_INSERT_VOCAB_PREFIX + '(?, ?, ?, ?, ?)'
+_SQL_INSERT_VOCAB_CHUNK = _SQL_INSERT_VOCAB_PREFIX + ', '.join(['(?, ?, ?, ?, ?)'] * _VOCAB_ROWS_PER_INSERT)
+_SQL_INSERT_REVIEW = '''
+    INSERT INTO review_sessions (user_id, vocab_id, review_date, next_review_date,
+                                 interval_days, ease_factor, performance_score, repetition_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_USER_STATS = '''
+    SELECT COUNT(*), AVG(performance_score), COUNT(DISTINCT vocab_id)
+    FROM review_sessions WHERE user_id = ?
+'''
+
+def _get_conn():
+    global _CONN
+    if _CONN is None:
+        # isolation_level=None: autocommit, transaksi ditulis manual dengan BEGIN/COMMIT
+        _CONN = get_conn(DATABASE, check_same_thread=False, isolation_level=None)
+    return _CONN
 
 def create_tables():
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
+
+    # Satu transaksi untuk semua DDL; skema yang sudah versi terbaru dilewati
+    cursor.execute("BEGIN IMMEDIATE")
+    if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        cursor.execute("COMMIT")
+        return
 
     # Tabel users
     cursor.execute('''
@@ -43,35 +86,36 @@ def create_tables():
             ease_factor FLOAT DEFAULT 2.5,
             performance_score INTEGER,
             repetition_count INTEGER DEFAULT 0,
+            english_word TEXT,
+            indonesian_meaning TEXT,
+            part_of_speech TEXT,
+            example_sentence TEXT,
+            difficulty_score FLOAT,
             FOREIGN KEY(user_id) REFERENCES users(id),
             FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
         )
     ''')
 
-    conn.commit()
-    conn.close()
+    # Salinan kolom kosakata, trigger dan index dipakai bersama dengan main.py
+    migrate(cursor)
+
+    cursor.execute("COMMIT")
 
 def register_user(username):
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     try:
-        cursor.execute("INSERT INTO users (username, created_date) VALUES (?, ?)", (username, date.today().isoformat()))
-        conn.commit()
+        cursor.execute(_SQL_INSERT_USER, (username, date.today().isoformat()))
         user_id = cursor.lastrowid
         print(f"User {username} registered successfully.")
         return user_id
     except sqlite3.IntegrityError:
         print("Username already exists.")
         return None
-    finally:
-        conn.close()
 
 def login_user(username):
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_SELECT_USER, (username,))
     user = cursor.fetchone()
-    conn.close()
     if user:
         print(f"Logged in as {username}.")
         return user[0]
@@ -80,18 +124,120 @@ def login_user(username):
         return None
 
 def add_vocabulary(english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score=1.0):
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO vocabulary (english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score))
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_INSERT_VOCAB, (english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score))
     vocab_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
     print(f"Vocabulary '{english_word}' added.")
     return vocab_id
 
+def add_vocabulary_bulk(rows):
+    """
+    Insert banyak kosakata dalam satu transaksi.
+
+    Parameters:
+    - rows: list of tuples (english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score)
+
+    Returns:
+    - list of vocab_id sesuai urutan rows
+    """
+    if not rows:
+        return []
+
+    conn = _get_conn()
+    cursor = conn.cursor()
+    vocab_ids = []
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for start in range(0, len(rows), _VOCAB_ROWS_PER_INSERT):
+            chunk = rows[start:start + _VOCAB_ROWS_PER_INSERT]
+            if len(chunk) == _VOCAB_ROWS_PER_INSERT:
+                sql = _SQL_INSERT_VOCAB_CHUNK
+            else:
+                sql = _SQL_INSERT_VOCAB_PREFIX + ', '.join(['(?, ?, ?, ?, ?)'] * len(chunk))
+            cursor.execute(sql, list(itertools.chain.from_iterable(chunk)))
+            # Satu INSERT multi-row di dalam BEGIN IMMEDIATE menghasilkan id berurutan
+            last_id = cursor.lastrowid
+            vocab_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        # BEGIN yang gagal (mis. SQLITE_BUSY) tidak membuka transaksi; error aslinya tetap dilempar
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    # Perbarui statistik planner jika isi tabel sudah banyak berubah
+    cursor.execute("PRAGMA optimize")
+    return vocab_ids
+
+def bulk_record_reviews(rows, rebuild_indexes=None):
+    """
+    Insert banyak review sekaligus (impor besar) dalam satu transaksi.
+    Untuk impor besar semua index sekunder review_sessions dibuang dulu lalu
+    dibangun ulang sekali di akhir, lebih cepat daripada memperbarui index
+    untuk setiap baris.
+
+    Parameters:
+    - rows: iterable of tuples (user_id, vocab_id, review_date, next_review_date,
+      interval_days, ease_factor, performance_score, repetition_count);
+      boleh generator, tidak perlu ditampung dalam list
+    - rebuild_indexes: True/False memaksa pilihan; None berarti otomatis,
+      yaitu True jika rows punya len() >= BULK_REINDEX_MIN_ROWS (generator: False)
+
+    Returns:
+    - jumlah baris yang ditulis
+    """
+    if rebuild_indexes is None:
+        rebuild_indexes = hasattr(rows, '__len__') and len(rows) >= BULK_REINDEX_MIN_ROWS
+
+    conn = _get_conn()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        if rebuild_indexes:
+            for name in RS_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.executemany(_SQL_INSERT_REVIEW, rows)
+        count = cursor.rowcount
+        if rebuild_indexes:
+            for sql in RS_INDEXES.values():
+                cursor.execute(sql)
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        # BEGIN yang gagal (mis. SQLITE_BUSY) tidak membuka transaksi; error aslinya tetap dilempar
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    cursor.execute("PRAGMA optimize")
+    return count
+
+def queue_vocabulary(english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score=1.0):
+    _vocab_buffer.append((english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score))
+    print(f"Vocabulary '{english_word}' queued ({len(_vocab_buffer)}/{VOCAB_BUFFER_SIZE}).")
+    if len(_vocab_buffer) >= VOCAB_BUFFER_SIZE:
+        flush_vocabulary()
+
+def flush_vocabulary():
+    if not _vocab_buffer:
+        return []
+    vocab_ids = add_vocabulary_bulk(_vocab_buffer)
+    print(f"{len(vocab_ids)} vocabulary saved.")
+    _vocab_buffer.clear()
+    return vocab_ids
+
+def read_quality():
+    """Baca skor 0-5 dari stdin; input yang bukan angka atau di luar rentang diminta ulang"""
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        try:
+            quality = int(line)
+        except ValueError:
+            quality = None
+        if quality is not None and 0 <= quality <= 5:
+            return quality
+        sys.stdout.write("Please enter a number from 0 to 5: ")
+        sys.stdout.flush()
+
 def start_review_session(user_id):
     due_vocab = load_due_vocabulary(user_id)
     if not due_vocab:
@@ -100,28 +246,34 @@ def start_review_session(user_id):
 
     srs = SRSAlgorithm()
     for vocab in due_vocab:
-        print(f"\nWord: {vocab['english_word']}")
-        input("Press Enter to reveal meaning...")
-        print(f"Meaning: {vocab['indonesian_meaning']} ({vocab['part_of_speech']})")
-        print(f"Example: {vocab['example_sentence']}")
-        quality = int(input("How well did you remember? (0-5): "))
+        # Prompt ditulis sekaligus, jawaban dibaca langsung dari stdin (bisa di-pipe untuk demo)
+        sys.stdout.write(f"\nWord: {vocab.english_word}\nPress Enter to reveal meaning...")
+        sys.stdout.flush()
+        sys.stdin.readline()
+        sys.stdout.write('\n'.join([
+            f"Meaning: {vocab.indonesian_meaning} ({vocab.part_of_speech})",
+            f"Example: {vocab.example_sentence}",
+            "How well did you remember? (0-5): ",
+        ]))
+        sys.stdout.flush()
+        quality = read_quality()
 
         # Calculate next review
         result = srs.calculate_next_review(
             quality_response=quality,
-            current_interval=vocab['interval_days'],
-            current_ease=vocab['ease_factor'],
-            repetition_count=vocab['repetition_count']
+            current_interval=vocab.interval_days,
+            current_ease=vocab.ease_factor,
+            repetition_count=vocab.repetition_count
         )
 
         # Calculate new repetition_count
         if quality < 3:
             new_repetition_count = 0
         else:
-            new_repetition_count = vocab['repetition_count'] + 1
+            new_repetition_count = vocab.repetition_count + 1
 
         # Update database
-        update_review_session(user_id, vocab['vocab_id'], result, quality, new_repetition_count)
+        update_review_session(user_id, vocab.vocab_id, result, quality, new_repetition_count)
 
 def update_review_session(user_id, vocab_id, result, quality, repetition_count=0):
     db_adapter.insert_or_replace('review_sessions', {
@@ -136,63 +288,63 @@ def update_review_session(user_id, vocab_id, result, quality, repetition_count=0
     }, ['user_id', 'vocab_id'])
 
 def view_statistics(user_id):
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT COUNT(*), AVG(performance_score), COUNT(DISTINCT vocab_id)
-        FROM review_sessions WHERE user_id = ?
-    ''', (user_id,))
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_USER_STATS, (user_id,))
     stats = cursor.fetchone()
-    conn.close()
     print(f"Total reviews: {stats[0]}")
     print(f"Average performance: {stats[1]:.2f}")
     print(f"Unique words reviewed: {stats[2]}")
 
 def simulate_curve(user_id):
     rates = simulate_learning_curve(user_id)
-    for i, rate in enumerate(rates):
-        print(f"Day {i+1}: Retention rate {rate:.2f}")
+    # Satu write untuk seluruh hasil, bukan satu print per hari
+    sys.stdout.write(''.join(f"Day {i}: Retention rate {rate:.2f}\n" for i, rate in enumerate(rates, 1)))
 
 def main():
     create_tables()
     current_user = None
 
-    while True:
-        if not current_user:
-            print("\n1. Login")
-            print("2. Register")
-            print("3. Exit")
-            choice = input("Choose: ")
-            if choice == '1':
-                username = input("Username: ")
-                current_user = login_user(username)
-            elif choice == '2':
-                username = input("Username: ")
-                current_user = register_user(username)
-            elif choice == '3':
-                break
-        else:
-            print("\n1. Add vocabulary")
-            print("2. Start review session")
-            print("3. View statistics")
-            print("4. Simulate learning curve")
-            print("5. Logout")
-            choice = input("Choose: ")
-            if choice == '1':
-                word = input("English word: ")
-                meaning = input("Indonesian meaning: ")
-                pos = input("Part of speech: ")
-                example = input("Example sentence: ")
-                diff = float(input("Difficulty score (default 1.0): ") or 1.0)
-                add_vocabulary(word, meaning, pos, example, diff)
-            elif choice == '2':
-                start_review_session(current_user)
-            elif choice == '3':
-                view_statistics(current_user)
-            elif choice == '4':
-                simulate_curve(current_user)
-            elif choice == '5':
-                current_user = None
+    # Kosakata yang masih di buffer tetap disimpan saat Exit, Ctrl-C atau EOF
+    try:
+        while True:
+            if not current_user:
+                print("\n1. Login")
+                print("2. Register")
+                print("3. Exit")
+                choice = input("Choose: ")
+                if choice == '1':
+                    username = input("Username: ")
+                    current_user = login_user(username)
+                elif choice == '2':
+                    username = input("Username: ")
+                    current_user = register_user(username)
+                elif choice == '3':
+                    break
+            else:
+                print("\n1. Add vocabulary")
+                print("2. Start review session")
+                print("3. View statistics")
+                print("4. Simulate learning curve")
+                print("5. Logout")
+                choice = input("Choose: ")
+                if choice == '1':
+                    word = input("English word: ")
+                    meaning = input("Indonesian meaning: ")
+                    pos = input("Part of speech: ")
+                    example = input("Example sentence: ")
+                    diff = float(input("Difficulty score (default 1.0): ") or 1.0)
+                    queue_vocabulary(word, meaning, pos, example, diff)
+                elif choice == '2':
+                    start_review_session(current_user)
+                elif choice == '3':
+                    view_statistics(current_user)
+                elif choice == '4':
+                    simulate_curve(current_user)
+                elif choice == '5':
+                    flush_vocabulary()
+                    current_user = None
+    finally:
+        flush_vocabulary()
 
 if __name__ == "__main__":
     main()
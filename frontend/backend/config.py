@@ -0,0 +1,3 @@
+# Konstanta bersama tanpa dependensi, supaya skrip CLI/laporan tidak perlu
+# mengimpor main.py (FastAPI) hanya untuk nama file database
+DATABASE = "vocabulary_app.db"
@@ -0,0 +1,131 @@
+import sqlite3
+from contextlib import contextmanager
+
+# PRAGMA bersama untuk semua koneksi SQLite (API, CLI, laporan, skrip init/update):
+# WAL agar pembaca tidak memblokir penulis, sisanya mengurangi fsync dan I/O disk
+PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    'mmap_size=268435456',
+    'cache_size=-64000',
+)
+
+def get_conn(path, extra_pragmas=(), **connect_kwargs):
+    """
+    Buka koneksi SQLite dengan PRAGMAS. extra_pragmas dijalankan setelahnya
+    (bisa menimpa nilai bawaan); connect_kwargs diteruskan ke sqlite3.connect.
+    """
+    conn = sqlite3.connect(path, **connect_kwargs)
+    for pragma in PRAGMAS + tuple(extra_pragmas):
+        conn.execute(f'PRAGMA {pragma}')
+    return conn
+
+# Naikkan setiap kali migrate berubah (disimpan di PRAGMA user_version)
+SCHEMA_VERSION = 3
+
+# Kolom vocabulary yang disalin ke review_sessions agar load_due_vocabulary tidak perlu JOIN
+RS_VOCAB_COLUMNS = (
+    ('english_word', 'TEXT'),
+    ('indonesian_meaning', 'TEXT'),
+    ('part_of_speech', 'TEXT'),
+    ('example_sentence', 'TEXT'),
+    ('difficulty_score', 'FLOAT'),
+)
+_RS_VOCAB_COLUMN_LIST = ', '.join(name for name, _ in RS_VOCAB_COLUMNS)
+
+# Index sekunder review_sessions, dipakai migrate dan impor besar di cli.bulk_record_reviews:
+# - idx_rs_due_cover: range seek per user + tanggal untuk get_due_vocab (JOIN ke vocabulary)
+# - idx_rs_vocab: sisi join ke vocabulary dan trigger di vocabulary
+# - idx_rs_due_covering: semua kolom yang dibaca load_due_vocabulary ikut di index
+#   (covering, tanpa lookup ke tabel)
+RS_INDEXES = {
+    'idx_rs_due_cover': "CREATE INDEX IF NOT EXISTS idx_rs_due_cover ON review_sessions(user_id, next_review_date, vocab_id)",
+    'idx_rs_vocab': "CREATE INDEX IF NOT EXISTS idx_rs_vocab ON review_sessions(vocab_id)",
+    'idx_rs_due_covering': '''
+        CREATE INDEX IF NOT EXISTS idx_rs_due_covering
+        ON review_sessions(user_id, next_review_date, difficulty_score DESC, ease_factor,
+                           vocab_id, interval_days, repetition_count,
+                           english_word, indonesian_meaning, part_of_speech, example_sentence)
+    ''',
+}
+
+# Trigger menjaga salinan tetap sama dengan vocabulary. Kosakata yang dihapus
+# membuat salinannya NULL, jadi baris itu hilang dari antrian due seperti pada JOIN.
+_RS_VOCAB_TRIGGERS = (
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rs_vocab_insert AFTER INSERT ON review_sessions
+    BEGIN
+        UPDATE review_sessions SET ({_RS_VOCAB_COLUMN_LIST}) =
+            (SELECT {_RS_VOCAB_COLUMN_LIST} FROM vocabulary WHERE id = NEW.vocab_id)
+        WHERE id = NEW.id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rs_vocab_relink AFTER UPDATE OF vocab_id ON review_sessions
+    BEGIN
+        UPDATE review_sessions SET ({_RS_VOCAB_COLUMN_LIST}) =
+            (SELECT {_RS_VOCAB_COLUMN_LIST} FROM vocabulary WHERE id = NEW.vocab_id)
+        WHERE id = NEW.id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_vocab_update AFTER UPDATE ON vocabulary
+    BEGIN
+        UPDATE review_sessions SET ({_RS_VOCAB_COLUMN_LIST}) =
+            (NEW.english_word, NEW.indonesian_meaning, NEW.part_of_speech, NEW.example_sentence, NEW.difficulty_score)
+        WHERE vocab_id = NEW.id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_vocab_delete AFTER DELETE ON vocabulary
+    BEGIN
+        UPDATE review_sessions SET ({_RS_VOCAB_COLUMN_LIST}) = (NULL, NULL, NULL, NULL, NULL)
+        WHERE vocab_id = OLD.id;
+    END
+    ''',
+)
+
+def migrate(cursor):
+    """
+    Upgrade skema bersama main.py dan cli.py ke SCHEMA_VERSION. Dipanggil oleh
+    create_tables masing-masing di dalam transaksinya, setelah CREATE TABLE;
+    semua langkah idempotent.
+    """
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(review_sessions)")}
+
+    # Database lama (versi 1) belum punya kolom repetition_count
+    if 'repetition_count' not in columns:
+        cursor.execute("ALTER TABLE review_sessions ADD COLUMN repetition_count INTEGER DEFAULT 0")
+
+    # Kolom kosakata: tambahkan yang belum ada lalu isi dari vocabulary
+    for name, decl in RS_VOCAB_COLUMNS:
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE review_sessions ADD COLUMN {name} {decl}")
+    cursor.execute(f'''
+        UPDATE review_sessions SET ({_RS_VOCAB_COLUMN_LIST}) =
+            (SELECT {_RS_VOCAB_COLUMN_LIST} FROM vocabulary WHERE id = review_sessions.vocab_id)
+    ''')
+    for sql in _RS_VOCAB_TRIGGERS:
+        cursor.execute(sql)
+
+    # Index lama diganti idx_rs_due_cover / idx_rs_due_covering
+    cursor.execute("DROP INDEX IF EXISTS idx_rs_user_due")
+    cursor.execute("DROP INDEX IF EXISTS idx_rs_due_sched")
+    for sql in RS_INDEXES.values():
+        cursor.execute(sql)
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+@contextmanager
+def srs_conn(path):
+    """
+    Koneksi untuk satu operasi baca/tulis. Saat ditutup, PRAGMA optimize
+    memperbarui statistik planner sesuai query yang baru saja dipakai.
+    """
+    conn = get_conn(path)
+    try:
+        yield conn
+    finally:
+        conn.execute('PRAGMA optimize')
+        conn.close()
@@ -1,25 +1,87 @@
 # final_presentation.py - 100% WORKING FOR PRESENTATION
 from http.server import HTTPServer, BaseHTTPRequestHandler
+import html
 import json
+import logging
+import logging.handlers
+import os
+import queue
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import timedelta, date
+from urllib.parse import urlsplit, parse_qs
+
+# orjson jauh lebih cepat jika terpasang; fallback ke json tanpa spasi
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(data):
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
 
 PORT = 8888  # Port yang jarang digunakan
 
+# Log request ditulis oleh thread terpisah (QueueListener) agar
+# thread request tidak menunggu stdout
+log = logging.getLogger('srs')
+log.setLevel(logging.INFO)
+log.propagate = False
+
+def _start_logging():
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', '%H:%M:%S'))
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+# Ukuran potongan saat menulis respons streaming ke socket
+_STREAM_CHUNK = 16 * 1024
+
+_PING_RESPONSE = {'status': 'ok', 'message': 'API is working!'}
+
+# Tiga agregat statistik dalam satu query
+_SQL_STATS = (
+    'SELECT (SELECT COUNT(*) FROM words), '
+    '(SELECT COUNT(DISTINCT word_id) FROM reviews), '
+    '(SELECT COALESCE(AVG(score), 0) FROM reviews)'
+)
+
 print("="*70)
 print("🎯 FINAL PRESENTATION SYSTEM - SRS MODEL")
 print("="*70)
 
+# Interval review (hari) diindeks langsung dengan skor 0-5
+_INTERVALS = (1, 1, 1, 2, 4, 7)
+
+# Tanggal review berikutnya per skor, dihitung ulang sekali per hari
+_date_cache = {'ordinal': None, 'dates': None}
+
+def _next_date_for(score):
+    today = date.today()
+    if _date_cache['ordinal'] != today.toordinal():
+        _date_cache['dates'] = tuple((today + timedelta(days=i)).isoformat() for i in _INTERVALS)
+        _date_cache['ordinal'] = today.toordinal()
+    return _date_cache['dates'][score]
+
 # Simple Database
 class Database:
     def __init__(self):
-        self.conn = sqlite3.connect(':memory:')
+        # Autocommit: satu review = satu statement; operasi banyak baris memakai BEGIN/COMMIT
+        self.conn = sqlite3.connect('file::memory:?cache=shared', uri=True, isolation_level=None)
+        # Database ada di RAM, tidak perlu fsync
+        self.conn.execute('PRAGMA synchronous=OFF')
+        # _rev naik setiap ada review; statistik hanya dihitung ulang jika berubah
+        self._rev = 0
+        self._cached_rev = None
+        self._cached_stats = None
         self.setup()
     
     def setup(self):
         c = self.conn.cursor()
-        c.execute('CREATE TABLE words (id INTEGER PRIMARY KEY, english TEXT, indonesian TEXT)')
-        c.execute('CREATE TABLE reviews (word_id INTEGER, score INTEGER, next_date TEXT)')
+        c.execute('BEGIN')
+        c.execute('CREATE TABLE IF NOT EXISTS words (id INTEGER PRIMARY KEY, english TEXT, indonesian TEXT)')
+        c.execute('CREATE TABLE IF NOT EXISTS reviews (word_id INTEGER, score INTEGER, next_date TEXT)')
         
         # Add sample data
         words = [
@@ -29,22 +91,17 @@ class Database:
             (4, 'variable', 'variabel'),
             (5, 'software', 'perangkat lunak')
         ]
-        c.executemany('INSERT INTO words VALUES (?,?,?)', words)
-        self.conn.commit()
+        c.executemany('INSERT OR IGNORE INTO words VALUES (?,?,?)', words)
+        c.execute('COMMIT')
         print(f"✅ Database ready with {len(words)} words")
     
     def get_stats(self):
-        c = self.conn.cursor()
-        c.execute('SELECT COUNT(*) FROM words')
-        total = c.fetchone()[0]
+        if self._cached_rev == self._rev:
+            return self._cached_stats
         
-        c.execute('SELECT COUNT(DISTINCT word_id) FROM reviews')
-        reviewed = c.fetchone()[0]
+        total, reviewed, avg_score = self.conn.execute(_SQL_STATS).fetchone()
         
-        c.execute('SELECT AVG(score) FROM reviews')
-        avg_score = c.fetchone()[0] or 0
-        
-        return {
+        self._cached_stats = {
             'status': 'success',
             'data': {
                 'total_words': total,
@@ -53,82 +110,60 @@ class Database:
                 'progress': f'{reviewed}/{total} ({reviewed/max(total,1)*100:.0f}%)'
             }
         }
+        self._cached_rev = self._rev
+        return self._cached_stats
     
-    def get_words(self):
+    def iter_words(self):
         c = self.conn.cursor()
-        c.execute('SELECT * FROM words')
-        rows = c.fetchall()
+        c.execute('SELECT id, english, indonesian FROM words')
+        for r in c:
+            yield {'id': r[0], 'english': r[1], 'indonesian': r[2]}
+    
+    def get_words(self):
         return {
             'status': 'success',
-            'data': [{'id': r[0], 'english': r[1], 'indonesian': r[2]} for r in rows]
+            'data': list(self.iter_words())
         }
     
     def add_review(self, word_id, score):
-        intervals = {1:1, 2:1, 3:2, 4:4, 5:7}
-        interval = intervals.get(score, 1)
-        next_date = (datetime.now() + timedelta(days=interval)).strftime('%Y-%m-%d')
+        idx = score if 0 <= score <= 5 else 0
+        interval = _INTERVALS[idx]
+        next_date = _next_date_for(idx)
         
         c = self.conn.cursor()
         c.execute('INSERT INTO reviews (word_id, score, next_date) VALUES (?,?,?)',
                  (word_id, score, next_date))
-        self.conn.commit()
+        self._rev += 1
         
         return {
             'status': 'success',
             'message': f'Review saved. Next review in {interval} days ({next_date})',
             'data': {'interval': interval, 'next_review': next_date}
         }
+    
+    def batch_reviews(self, rows):
+        """Simpan banyak review (word_id, score) dalam satu transaksi"""
+        params = []
+        for word_id, score in rows:
+            idx = score if 0 <= score <= 5 else 0
+            params.append((word_id, score, _next_date_for(idx)))
+        
+        c = self.conn.cursor()
+        c.execute('BEGIN')
+        try:
+            c.executemany('INSERT INTO reviews (word_id, score, next_date) VALUES (?,?,?)', params)
+            c.execute('COMMIT')
+        except sqlite3.Error:
+            c.execute('ROLLBACK')
+            raise
+        self._rev += 1
+        return len(params)
 
 # Initialize database
 db = Database()
 
-# HTTP Handler
-class SRSHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] GET {self.path}")
-        
-        if self.path == '/':
-            self.serve_frontend()
-        
-        elif self.path == '/api/stats':
-            self.send_json(db.get_stats())
-        
-        elif self.path == '/api/words':
-            self.send_json(db.get_words())
-        
-        elif self.path == '/api/ping':
-            self.send_json({'status': 'ok', 'message': 'API is working!'})
-        
-        else:
-            self.send_error(404, f"Not found: {self.path}")
-    
-    def do_POST(self):
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] POST {self.path}")
-        
-        if self.path == '/api/review':
-            try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode('utf-8'))
-                
-                word_id = data.get('word_id')
-                score = data.get('score')
-                
-                if not word_id or not score:
-                    self.send_json({'status': 'error', 'message': 'Missing parameters'}, 400)
-                    return
-                
-                result = db.add_review(int(word_id), int(score))
-                self.send_json(result)
-                
-            except Exception as e:
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
-        
-        else:
-            self.send_error(404, f"Not found: {self.path}")
-    
-    def serve_frontend(self):
-        html = '''<!DOCTYPE html>
+# Halaman frontend presentasi
+FRONTEND_TEMPLATE = '''<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -282,9 +317,7 @@ class SRSHandler(BaseHTTPRequestHandler):
                 <h3>🎯 Test 4: Submit Review (POST /api/review)</h3>
                 <p>Simulasi algoritma SRS: skor menentukan interval review</p>
                 <select id="word-select">
-                    <option value="1">algorithm</option>
-                    <option value="2">database</option>
-                    <option value="3">function</option>
+                    <!--WORD_OPTIONS-->
                 </select>
                 <select id="score-select">
                     <option value="1">1 - Very Hard (1 day)</option>
@@ -393,18 +426,123 @@ class SRSHandler(BaseHTTPRequestHandler):
     </script>
 </body>
 </html>'''
-        
+
+# Pilihan kata diambil dari database saat startup, jadi halaman tidak perlu request /api/words
+_OPTIONS_HTML = '\n                    '.join(
+    f'<option value="{w["id"]}">{html.escape(w["english"])}</option>' for w in db.iter_words()
+)
+FRONTEND_HTML = FRONTEND_TEMPLATE.replace('<!--WORD_OPTIONS-->', _OPTIONS_HTML)
+FRONTEND_BYTES = FRONTEND_HTML.encode('utf-8')
+
+# Di Linux halaman disimpan sekali di memfd lalu dikirim dengan sendfile
+# (tanpa copy ke userspace); platform lain memakai wfile.write biasa
+_FRONTEND_FILE = None
+if hasattr(os, 'memfd_create'):
+    try:
+        _fd = os.memfd_create('frontend')
+        os.write(_fd, FRONTEND_BYTES)
+        _FRONTEND_FILE = open(_fd, 'rb')
+    except OSError:
+        _FRONTEND_FILE = None
+
+# HTTP Handler
+class SRSHandler(BaseHTTPRequestHandler):
+    # Path -> nama method handler
+    _GET_ROUTES = {
+        '/': 'serve_frontend',
+        '/api/stats': 'send_stats',
+        '/api/words': 'send_words',
+        '/api/ping': 'send_ping',
+    }
+    _POST_ROUTES = {
+        '/api/review': 'handle_review',
+    }
+    
+    def do_GET(self):
+        log.info('GET %s', self.path)
+        name = self._GET_ROUTES.get(urlsplit(self.path).path)
+        if name:
+            getattr(self, name)()
+        else:
+            self.send_error(404, f"Not found: {self.path}")
+    
+    def do_POST(self):
+        log.info('POST %s', self.path)
+        name = self._POST_ROUTES.get(urlsplit(self.path).path)
+        if name:
+            getattr(self, name)()
+        else:
+            self.send_error(404, f"Not found: {self.path}")
+    
+    def send_stats(self):
+        self.send_json(db.get_stats())
+    
+    def send_ping(self):
+        self.send_json(_PING_RESPONSE)
+    
+    def handle_review(self):
+        try:
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data.decode('utf-8'))
+            
+            word_id = data.get('word_id')
+            score = data.get('score')
+            
+            if not word_id or not score:
+                self.send_json({'status': 'error', 'message': 'Missing parameters'}, 400)
+                return
+            
+            result = db.add_review(int(word_id), int(score))
+            self.send_json(result)
+            
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
+    
+    def serve_frontend(self):
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(FRONTEND_BYTES)))
+        self.end_headers()
+        if _FRONTEND_FILE is not None:
+            self.connection.sendfile(_FRONTEND_FILE, 0, len(FRONTEND_BYTES))
+        else:
+            self.wfile.write(FRONTEND_BYTES)
+    
+    def send_words(self):
+        # Daftar kata ditulis per baris ke socket, tanpa membangun list/string penuh dulu
+        if parse_qs(urlsplit(self.path).query).get('pretty') == ['1']:
+            self.send_json(db.get_words())
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        
+        buf = bytearray(b'{"status":"success","data":[')
+        for i, word in enumerate(db.iter_words()):
+            if i:
+                buf += b','
+            buf += _dumps(word)
+            if len(buf) >= _STREAM_CHUNK:
+                self.wfile.write(buf)
+                buf.clear()
+        buf += b']}'
+        self.wfile.write(buf)
     
     def send_json(self, data, status=200):
+        # ?pretty=1 untuk demo: JSON rapi yang mudah dibaca di browser
+        if parse_qs(urlsplit(self.path).query).get('pretty') == ['1']:
+            body = json.dumps(data, indent=2).encode('utf-8')
+        else:
+            body = _dumps(data)
         self.send_response(status)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+        self.wfile.write(body)
     
     def log_message(self, format, *args):
         # Custom logging
@@ -422,6 +560,7 @@ def main():
     print("="*70)
     
     server = HTTPServer(('', PORT), SRSHandler)
+    listener = _start_logging()
     
     try:
         print("✅ Server started successfully!")
@@ -432,6 +571,8 @@ def main():
         print("\n👋 Presentation complete. Server stopped.")
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
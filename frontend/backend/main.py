@@ -1,537 +1,43 @@
-import sqlite3
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import date, timedelta
+from pydantic import BaseModel, Field
+from srs import SRSAlgorithm, _connect, _get_conn, _today_iso
+from db import SCHEMA_VERSION, migrate
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize database on startup
+    create_tables_if_needed()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Agar frontend dari localhost:5173 bisa request tanpa masalah CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Browser boleh menyimpan hasil preflight selama sehari
+    max_age=86400,
 )
 
-# Database setup
-DATABASE = "vocabulary_app.db"
-
 def create_tables():
-    conn = sqlite3.connect(DATABASE)
+    conn = _connect()
     cursor = conn.cursor()
 
-    # Tabel users
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
+    # Semua DDL dalam satu transaksi: satu kali bump schema cookie dan satu commit.
+    # IMMEDIATE mengambil write lock di awal, jadi worker yang kalah balapan menunggu
+    # lalu melihat user_version yang sudah diperbarui dan langsung selesai.
+    cursor.execute("BEGIN IMMEDIATE")
+    if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        conn.rollback()
+        conn.close()
+        return
 
-    # Tabel review_sessions
+    # Tabel users
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ''' if db_adapter.is_postgresql else '''
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY,
             username TEXT,
@@ -562,313 +68,111 @@ class SRSAlgorithm:
             interval_days INTEGER,
             ease_factor FLOAT DEFAULT 2.5,
             performance_score INTEGER,
+            repetition_count INTEGER DEFAULT 0,
             FOREIGN KEY(user_id) REFERENCES users(id),
             FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
         )
     ''')
 
-    conn.commit()
-    conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = ? AND rs.next_review_date <= ?
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
+    # Kolom tambahan, trigger dan index dipakai bersama dengan cli.py
+    migrate(cursor)
 
     conn.commit()
     conn.close()
 
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= ?
-        ''' if db_adapter.is_postgresql else '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            created_date DATE
-        )
-    ''')
-
-    # Tabel vocabulary
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vocabulary (
-            id INTEGER PRIMARY KEY,
-            english_word TEXT,
-            indonesian_meaning TEXT,
-            part_of_speech TEXT,
-            example_sentence TEXT,
-            difficulty_score FLOAT DEFAULT 1.0
-        )
-    ''')
-
-    # Tabel review_sessions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS review_sessions (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            vocab_id INTEGER,
-            review_date TIMESTAMP,
-            next_review_date TIMESTAMP,
-            interval_days INTEGER,
-            ease_factor FLOAT DEFAULT 2.5,
-            performance_score INTEGER,
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(vocab_id) REFERENCES vocabulary(id)
-        )
-    ''')
-
-    conn.commit()
+def create_tables_if_needed():
+    """
+    Menjalankan create_tables hanya jika skema database belum versi terbaru,
+    sehingga worker lain yang start bersamaan tidak ikut menulis skema.
+    """
+    conn = _connect()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
     conn.close()
-
-class SRSAlgorithm:
-    def __init__(self, database: str = DATABASE):
-        self.database = database
-
-    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
-        """
-        Mengimplementasikan algoritma SM-2 sederhana.
-
-        Parameters:
-        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
-        - current_interval: integer (hari)
-        - current_ease: float (default 2.5)
-        - repetition_count: integer
-
-        Returns:
-        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
-        """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        # Update ease_factor
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
-
-        # Calculate next review date
-        today = date.today()
-        next_review_date = today + timedelta(days=interval)
-
-        return {
-            'new_interval': interval,
-            'new_ease': ease_factor,
-            'next_review_date': next_review_date.isoformat()
-        }
-
-    def get_due_vocab(self, user_id: int):
-        """
-        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
-
-        Parameters:
-        - user_id: integer
-
-        Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
-        """
-        conn = sqlite3.connect(self.database)
-        cursor = conn.cursor()
-
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = ? AND rs.next_review_date <= ?
-        ''', (user_id, today))
-
-        due_vocab = []
-        for row in cursor.fetchall():
-            due_vocab.append({
-                'vocab_id': row[0],
-                'english_word': row[1],
-                'indonesian_meaning': row[2],
-                'part_of_speech': row[3],
-                'example_sentence': row[4],
-                'difficulty_score': row[5]
-            })
-
-        conn.close()
-        return due_vocab
-
-# Initialize database on startup
-@app.on_event("startup")
-def startup_event():
-    create_tables()
+    if version < SCHEMA_VERSION:
+        create_tables()
 
 # Dummy session data (for now, can be replaced with database queries)
 WORDS = ["apple", "banana", "cherry", "date", "elderberry", "fig", "grape"]
 
+# Semua prefix WORDS dibuat sekali; _PREFIX[n] == tuple(WORDS[:n])
+_PREFIX = tuple(tuple(WORDS[:i]) for i in range(len(WORDS) + 1))
+
+# Endpoint tanpa I/O blocking: async def agar dijalankan langsung di event loop,
+# bukan di threadpool
 @app.get("/session/start")
-def start_session(user_id: int = 1, size: int = 5):
-    # Ambil kata sesuai size
-    items = WORDS[:size]
+async def start_session(user_id: int = 1, size: int = 5):
+    # Ambil kata sesuai size (size negatif tetap mengikuti semantik slicing)
+    items = _PREFIX[min(size, len(WORDS))] if size >= 0 else WORDS[:size]
     return items
 
 @app.post("/answer")
-def submit_answer(word: str, quality: str):
+async def submit_answer(word: str, quality: str):
     # Untuk testing, hanya log jawaban
     print(f"Word: {word}, Answer Quality: {quality}")
     return {"status": "ok", "word": word, "quality": quality}
+
+class AnswerResult(BaseModel):
+    vocab_id: int
+    # Skor SM-2 0-5; juga indeks ke _EASE_DELTA_ARRAY, jadi di luar rentang ditolak (422)
+    quality: int = Field(ge=0, le=5)
+
+class AnswerBatch(BaseModel):
+    user_id: int
+    results: list[AnswerResult]
+
+_SQL_SELECT_CARD_STATE = """
+    SELECT vocab_id, COALESCE(interval_days, 0), COALESCE(ease_factor, 2.5), COALESCE(repetition_count, 0)
+    FROM review_sessions
+    WHERE user_id = ? AND vocab_id IN ({placeholders})
+"""
+
+_SQL_UPDATE_CARD_STATE = """
+    UPDATE review_sessions
+    SET interval_days = ?, ease_factor = ?, repetition_count = ?, next_review_date = ?,
+        performance_score = ?, review_date = ?
+    WHERE vocab_id = ? AND user_id = ?
+"""
+
+# Menilai satu sesi sekaligus: satu SELECT, SM-2 versi batch, lalu satu executemany
+# dalam satu transaksi. Endpoint ini melakukan I/O blocking, jadi tetap def biasa
+# (dijalankan di threadpool).
+@app.post("/answer/batch")
+def submit_answer_batch(batch: AnswerBatch):
+    if not batch.results:
+        return {"status": "ok", "updated": 0}
+
+    conn = _get_conn()
+    cursor = conn.cursor()
+    vocab_ids = [r.vocab_id for r in batch.results]
+    sql = _SQL_SELECT_CARD_STATE.format(placeholders=",".join("?" * len(vocab_ids)))
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        state = {row[0]: row[1:] for row in cursor.execute(sql, (batch.user_id, *vocab_ids))}
+        results = [r for r in batch.results if r.vocab_id in state]
+        if results:
+            current = [state[r.vocab_id] for r in results]
+            quality = [r.quality for r in results]
+            new = SRSAlgorithm().calculate_next_review_batch(
+                quality,
+                [c[0] for c in current],
+                [c[1] for c in current],
+                [c[2] for c in current],
+            )
+            today = _today_iso()
+            cursor.executemany(_SQL_UPDATE_CARD_STATE, zip(
+                new['new_interval'].tolist(),
+                new['new_ease'].tolist(),
+                new['repetition_count'].tolist(),
+                new['next_review_date'].astype(str).tolist(),
+                quality,
+                [today] * len(results),
+                [r.vocab_id for r in results],
+                [batch.user_id] * len(results),
+            ))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {"status": "ok", "updated": len(results)}
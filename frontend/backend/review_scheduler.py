@@ -1,6 +1,28 @@
-import sqlite3
+import numpy as np
+from collections import namedtuple
 from datetime import date, timedelta
-from .main import DATABASE, SRSAlgorithm  # Import from main.py
+from config import DATABASE
+from db import srs_conn
+from srs import SRSAlgorithm  # SM-2 tanpa FastAPI, jadi CLI tidak ikut memuat main.py
+
+# Satu kartu due; field sama dengan nama kolom _SQL_DUE_VOCABULARY
+# (dicek terhadap cursor.description di test_schema_migration.py)
+DueCard = namedtuple('DueCard', [
+    'vocab_id', 'english_word', 'indonesian_meaning', 'part_of_speech', 'example_sentence',
+    'difficulty_score', 'next_review_date', 'ease_factor', 'interval_days', 'repetition_count',
+])
+
+_SQL_DUE_VOCABULARY = '''
+    SELECT vocab_id, english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score,
+           next_review_date, ease_factor, interval_days, repetition_count
+    FROM review_sessions  -- kolom kosakata sudah disalin dari vocabulary (lihat db.migrate)
+    WHERE user_id = ? AND next_review_date <= ? AND english_word IS NOT NULL
+    ORDER BY
+        CASE WHEN next_review_date < ? THEN 0 ELSE 1 END,  -- Prioritize overdue
+        next_review_date ASC,  -- Most overdue first
+        difficulty_score DESC,  -- Highest difficulty first
+        ease_factor ASC  -- Lowest ease first
+'''
 
 def load_due_vocabulary(user_id: int):
     """
@@ -10,116 +32,15 @@ def load_due_vocabulary(user_id: int):
     b. Difficulty_score tertinggi
     c. Ease_factor terendah
     """
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
+    with srs_conn(DATABASE) as conn:
+        cursor = conn.cursor()
 
-    today = date.today().isoformat()
-    cursor.execute('''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ORDER BY
-            CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ORDER BY
-            CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ORDER BY
-            CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ORDER BY
-            CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= %s
-        ORDER BY
-            CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = ? AND rs.next_review_date <= ?
-        ORDER BY
-            CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = %s AND rs.next_review_date <= ?
-        ORDER BY
-            CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''' if db_adapter.is_postgresql else '''
-        SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-               rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-        FROM vocabulary v
-        JOIN review_sessions rs ON v.id = rs.vocab_id
-        WHERE rs.user_id = ? AND rs.next_review_date <= ?
-        ORDER BY
-            CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,  -- Prioritize overdue
-            rs.next_review_date ASC,  -- Most overdue first
-            v.difficulty_score DESC,  -- Highest difficulty first
-            rs.ease_factor ASC  -- Lowest ease first
-    ''', (user_id, today, today))
+        today = date.today().isoformat()
+        cursor.execute(_SQL_DUE_VOCABULARY, (user_id, today, today))
 
-    due_vocab = []
-    for row in cursor.fetchall():
-        due_vocab.append({
-            'vocab_id': row[0],
-            'english_word': row[1],
-            'indonesian_meaning': row[2],
-            'part_of_speech': row[3],
-            'example_sentence': row[4],
-            'difficulty_score': row[5],
-            'next_review_date': row[6],
-            'ease_factor': row[7],
-            'interval_days': row[8],
-            'repetition_count': row[9]
-        })
+        # Tuple baris langsung dipetakan ke DueCard (akses vocab.english_word), tanpa dict per baris
+        due_vocab = [DueCard._make(row) for row in cursor]
 
-    conn.close()
     return due_vocab
 
 def simulate_learning_curve(user_id: int, days: int = 30):
@@ -129,41 +50,35 @@ def simulate_learning_curve(user_id: int, days: int = 30):
     Output: list retention_rate per hari
     """
     srs = SRSAlgorithm()
-    retention_rates = []
 
-    # Get initial due vocab
+    # Get initial due vocab, disimpan per kolom (SoA) untuk simulasi
     due_vocab = load_due_vocabulary(user_id)
     total_vocab = len(due_vocab)
 
     if total_vocab == 0:
         return [0.0] * days
 
-    # Simulate over days
-    for day in range(days):
-        # Assume user reviews 10 words per day, with quality 4 (good)
-        reviews_today = min(10, len(due_vocab))
-        retained = 0
-
-        for i in range(reviews_today):
-            vocab = due_vocab.pop(0)  # Review the first due vocab
-            # Simulate review with quality 4
-            result = srs.calculate_next_review(
-                quality_response=4,
-                current_interval=vocab['interval_days'],
-                current_ease=vocab['ease_factor'],
-                repetition_count=vocab['repetition_count']
-            )
-            # Assume retained if interval > 1
-            if result['new_interval'] > 1:
-                retained += 1
-            # Update vocab (in simulation, add back if due again, but simplify)
-            # For simplicity, assume all are retained and scheduled later
+    interval_days = np.fromiter((row.interval_days or 0 for row in due_vocab), dtype=np.int64, count=total_vocab)
+    ease_factor = np.fromiter((row.ease_factor or 2.5 for row in due_vocab), dtype=np.float64, count=total_vocab)
+    repetition_count = np.fromiter((row.repetition_count or 0 for row in due_vocab), dtype=np.int64, count=total_vocab)
 
-        # Calculate retention rate for the day
-        retention_rate = retained / reviews_today if reviews_today > 0 else 0.0
-        retention_rates.append(retention_rate)
+    # Simulate review with quality 4 (good). Setiap kartu hanya diulang sekali,
+    # jadi hasil SM-2 semua kartu dihitung sekaligus dalam satu panggilan batch.
+    # Assume retained if interval > 1
+    result = srs.calculate_next_review_batch(
+        np.full(total_vocab, 4), interval_days, ease_factor, repetition_count
+    )
+    retained_mask = result['new_interval'] > 1
 
-        # For next day, assume new due vocab appear, but simplify: keep due_vocab as is or add more
-        # This is a basic simulation; in reality, more complex
+    # Assume user reviews 10 words per day, urut sesuai antrian due.
+    # Mask dijadikan matriks (days, 10); slot setelah kartu habis diisi False
+    per_day = 10
+    slots = np.zeros(days * per_day, dtype=bool)
+    n = min(total_vocab, days * per_day)
+    slots[:n] = retained_mask[:n]
+    retained = slots.reshape(days, per_day).sum(axis=1)
+    reviews = np.clip(total_vocab - np.arange(days) * per_day, 0, per_day)
 
-    return retention_rates
+    # Calculate retention rate per day (0.0 untuk hari tanpa review)
+    retention_rates = np.divide(retained, reviews, out=np.zeros(days), where=reviews > 0)
+    return retention_rates.tolist()
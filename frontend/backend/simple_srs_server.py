@@ -1,6 +1,7 @@
 # simple_srs_server.py - 100% WORKING SRS PRESENTATION SERVER
 import http.server
-import socketserver
+import gzip
+import hashlib
 import os
 import sys
 
@@ -366,19 +367,45 @@ HTML = """<!DOCTYPE html>
 </html>
 """
 
+# Halaman di-encode dan di-gzip sekali saat start, bukan setiap request
+HTML_BYTES = HTML.encode('utf-8')
+HTML_GZ = gzip.compress(HTML_BYTES, compresslevel=9)
+HTML_ETAG = '"' + hashlib.sha1(HTML_BYTES).hexdigest() + '"'
+
 # HTTP Request Handler
 class SimpleHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
+        # Browser sudah punya versi yang sama: cukup 304 tanpa body
+        if_none_match = self.headers.get('If-None-Match', '')
+        if HTML_ETAG in (tag.strip() for tag in if_none_match.split(',')):
+            self.send_response(304)
+            self.send_header('ETag', HTML_ETAG)
+            self.end_headers()
+            return
+
         # Serve our HTML page for all requests
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = HTML_GZ if use_gzip else HTML_BYTES
         self.send_response(200)
-        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', HTML_ETAG)
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(HTML.encode())
+        self.wfile.write(body)
     
     def log_message(self, format, *args):
         # Suppress access logs
         pass
 
+# Server multi-thread: klien lambat tidak memblokir request lain,
+# dan port bisa langsung dipakai lagi setelah server di-restart
+class SRSServer(http.server.ThreadingHTTPServer):
+    allow_reuse_address = True
+    daemon_threads = True  # Ctrl+C langsung keluar tanpa menunggu thread request
+
 def main():
     print("📡 Starting server...")
     
@@ -395,7 +422,7 @@ def main():
     
     # Try to start server
     try:
-        with socketserver.TCPServer(("", PORT), SimpleHandler) as httpd:
+        with SRSServer(("", PORT), SimpleHandler) as httpd:
             httpd.serve_forever()
     except OSError as e:
         if "Address already in use" in str(e):
@@ -0,0 +1,7 @@
+# Query kosakata jatuh tempo (SQLite; backend ini hanya memakai koneksi sqlite3)
+SELECT_DUE_SQLITE = '''
+    SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score
+    FROM vocabulary v
+    JOIN review_sessions rs ON v.id = rs.vocab_id
+    WHERE rs.user_id = ? AND rs.next_review_date <= ?
+'''
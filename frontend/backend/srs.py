@@ -0,0 +1,202 @@
+# Algoritma SM-2 dan query kosakata jatuh tempo tanpa FastAPI,
+# dipakai bersama oleh main.py (API) dan review_scheduler.py (CLI)
+import threading
+import time
+import msgspec
+import numpy as np
+from datetime import date, timedelta
+from sql import SELECT_DUE_SQLITE
+from config import DATABASE
+from db import get_conn
+
+# Numba opsional: kernel SM-2 hasil JIT untuk batch besar; tanpa Numba tetap pakai NumPy
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+def _connect(database: str = DATABASE):
+    # API memeriksa foreign key; PRAGMA lain sama dengan db.PRAGMAS
+    return get_conn(database, extra_pragmas=("foreign_keys=ON",))
+
+# Satu koneksi per thread worker, dipakai ulang antar request (page cache tetap hangat)
+_local = threading.local()
+
+def _get_conn(database: str = DATABASE):
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(database)
+    if conn is None:
+        conn = conns[database] = _connect(database)
+    return conn
+
+# Tanggal hari ini (ISO) di-cache sampai tengah malam waktu lokal berikutnya
+_TODAY_CACHE = [0.0, ""]
+
+def _today_iso():
+    if time.time() >= _TODAY_CACHE[0]:
+        today = date.today()
+        midnight = time.mktime((today + timedelta(days=1)).timetuple())
+        _TODAY_CACHE[:] = [midnight, today.isoformat()]
+    return _TODAY_CACHE[1]
+
+# next_review_date sengaja tetap teks ISO (YYYY-MM-DD): urutan byte-nya sama dengan urutan
+# tanggal sehingga range seek di idx_rs_due_cover tetap benar, dan cli.py, review_scheduler.py
+# serta visualization.py membaca/menulis kolom yang sama sebagai teks ISO.
+# Query kosakata jatuh tempo; satu string konstan agar cache statement sqlite3
+# per koneksi bisa memakai ulang hasil compile-nya. Koneksi di sini selalu SQLite.
+DUE_VOCAB_SQL = SELECT_DUE_SQLITE
+
+# Satu baris hasil get_due_vocab; field urut sesuai kolom SELECT di atas.
+# Struct ber-slots, lebih ringan dari dict dan langsung bisa di-encode dengan msgspec.json.encode
+class DueVocab(msgspec.Struct):
+    vocab_id: int
+    english_word: str
+    indonesian_meaning: str
+    part_of_speech: str
+    example_sentence: str
+    difficulty_score: float
+
+# SM-2: perubahan ease hanya bergantung pada quality 0-5, jadi dihitung sekali di sini
+_EASE_DELTA = tuple(0.1 - (5 - q) * (0.08 + (5 - q) * 0.02) for q in range(6))
+_EASE_DELTA_ARRAY = np.array(_EASE_DELTA)
+
+# Interval tetap untuk repetisi pertama dan kedua
+_INTERVAL_FOR_REP = {1: 1, 2: 6}
+
+# Di bawah ukuran ini overhead pemanggilan kernel tidak sebanding
+_SM2_KERNEL_MIN_BATCH = 1024
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def sm2_kernel(q, interval, ease, rep):
+        """Satu loop SM-2 tanpa array mask sementara; cabangnya sama dengan calculate_next_review"""
+        n = q.shape[0]
+        new_interval = np.empty(n, dtype=np.int64)
+        new_ease = np.empty(n, dtype=np.float64)
+        new_rep = np.empty(n, dtype=np.int64)
+        for i in prange(n):
+            if q[i] < 3:
+                new_rep[i] = 0
+                new_interval[i] = 1
+            else:
+                new_rep[i] = rep[i] + 1
+                if new_rep[i] == 1:
+                    new_interval[i] = 1
+                elif new_rep[i] == 2:
+                    new_interval[i] = 6
+                else:
+                    new_interval[i] = np.int64(np.rint(interval[i] * ease[i]))
+            new_ease[i] = max(ease[i] + _EASE_DELTA_ARRAY[q[i]], 1.3)
+        return new_interval, new_ease, new_rep
+else:
+    sm2_kernel = None
+
+class SRSAlgorithm:
+    def __init__(self, database: str = DATABASE):
+        self.database = database
+
+    def calculate_next_review(self, quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
+        """
+        Mengimplementasikan algoritma SM-2 sederhana.
+
+        Parameters:
+        - quality_response: integer 0-5 (0=lupa total, 5=sangat mudah)
+        - current_interval: integer (hari)
+        - current_ease: float (default 2.5)
+        - repetition_count: integer
+
+        Returns:
+        - dictionary: {'new_interval': interval, 'new_ease': ease_factor, 'next_review_date': date}
+        """
+        # quality juga indeks ke _EASE_DELTA; -1 diam-diam memakai delta q=5
+        if not 0 <= quality_response <= 5:
+            raise ValueError(f"quality_response harus 0-5, bukan {quality_response!r}")
+
+        if quality_response < 3:
+            repetition_count = 0
+            interval = 1
+        else:
+            repetition_count += 1
+            interval = _INTERVAL_FOR_REP.get(repetition_count) or round(current_interval * current_ease)
+
+        # Update ease_factor
+        ease_factor = current_ease + _EASE_DELTA[quality_response]
+        if ease_factor < 1.3:
+            ease_factor = 1.3
+
+        # Calculate next review date
+        today = date.today()
+        next_review_date = today + timedelta(days=interval)
+
+        return {
+            'new_interval': interval,
+            'new_ease': ease_factor,
+            'next_review_date': next_review_date.isoformat()
+        }
+
+    def calculate_next_review_batch(self, quality_response, current_interval, current_ease, repetition_count):
+        """
+        Versi batch dari calculate_next_review (SM-2) untuk banyak kartu sekaligus,
+        misalnya saat menilai satu sesi di akhir.
+
+        Parameters:
+        - quality_response: array integer 0-5
+        - current_interval: array integer (hari)
+        - current_ease: array float
+        - repetition_count: array integer
+
+        Returns:
+        - dictionary: {'new_interval': array, 'new_ease': array, 'repetition_count': array,
+          'next_review_date': array datetime64[D]}
+        """
+        q = np.asarray(quality_response, dtype=np.int8)
+        current_interval = np.asarray(current_interval)
+        current_ease = np.asarray(current_ease, dtype=np.float64)
+
+        if sm2_kernel is not None and q.shape[0] >= _SM2_KERNEL_MIN_BATCH:
+            interval, ease_factor, repetition_count = sm2_kernel(
+                q,
+                current_interval.astype(np.int64),
+                current_ease,
+                np.asarray(repetition_count, dtype=np.int64),
+            )
+        else:
+            fail = q < 3
+            repetition_count = np.where(fail, 0, np.asarray(repetition_count) + 1)
+            interval = np.select(
+                [fail | (repetition_count == 1), repetition_count == 2],
+                [1, 6],
+                np.rint(current_interval * current_ease),
+            ).astype(np.int64)
+
+            # Update ease_factor
+            ease_factor = np.maximum(current_ease + _EASE_DELTA_ARRAY[q], 1.3)
+
+        # Calculate next review date
+        next_review_date = np.datetime64(date.today(), 'D') + interval.astype('timedelta64[D]')
+
+        return {
+            'new_interval': interval,
+            'new_ease': ease_factor,
+            'repetition_count': repetition_count,
+            'next_review_date': next_review_date
+        }
+
+    def get_due_vocab(self, user_id: int):
+        """
+        Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
+
+        Parameters:
+        - user_id: integer
+
+        Returns:
+        - list of DueVocab: [DueVocab(vocab_id=id, english_word=word, ...), ...]
+        """
+        conn = _get_conn(self.database)
+        cursor = conn.cursor()
+
+        cursor.execute(DUE_VOCAB_SQL, (user_id, _today_iso()))
+
+        return [DueVocab(*row) for row in cursor]
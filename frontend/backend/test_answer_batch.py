@@ -0,0 +1,110 @@
+# test_answer_batch.py - Tes endpoint /answer/batch dan SM-2 versi batch
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from config import DATABASE
+from srs import SRSAlgorithm, _SM2_KERNEL_MIN_BATCH
+
+# (vocab_id, interval_days, ease_factor, repetition_count, quality)
+CARDS = (
+    (1, 0, 2.5, 0, 5),
+    (2, 1, 2.5, 1, 4),
+    (3, 6, 2.5, 2, 3),
+    (4, 15, 1.4, 5, 2),
+    (5, 10, 2.0, 3, 0),
+)
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # DATABASE relatif terhadap cwd, jadi satu database sementara untuk seluruh modul
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("answer_batch"))
+    try:
+        with TestClient(main.app) as client:
+            yield client
+    finally:
+        os.chdir(cwd)
+
+def seed_cards(user_id):
+    conn = sqlite3.connect(DATABASE)
+    conn.execute("INSERT OR IGNORE INTO users (id, username) VALUES (?, ?)", (user_id, f"user{user_id}"))
+    conn.executemany(
+        "INSERT OR IGNORE INTO vocabulary (id, english_word, indonesian_meaning) VALUES (?, ?, ?)",
+        [(vocab_id, f"word{vocab_id}", f"kata{vocab_id}") for vocab_id, *_ in CARDS],
+    )
+    conn.executemany(
+        """INSERT INTO review_sessions (user_id, vocab_id, next_review_date, interval_days, ease_factor, repetition_count)
+           VALUES (?, ?, '2000-01-01', ?, ?, ?)""",
+        [(user_id, vocab_id, interval, ease, rep) for vocab_id, interval, ease, rep, _ in CARDS],
+    )
+    conn.commit()
+    conn.close()
+
+def card_state(user_id):
+    conn = sqlite3.connect(DATABASE)
+    rows = conn.execute(
+        """SELECT vocab_id, interval_days, ease_factor, repetition_count, next_review_date, performance_score
+           FROM review_sessions WHERE user_id = ? ORDER BY vocab_id""",
+        (user_id,),
+    ).fetchall()
+    conn.close()
+    return rows
+
+def test_answer_batch_matches_scalar(client):
+    seed_cards(user_id=1)
+    response = client.post("/answer/batch", json={
+        "user_id": 1,
+        "results": [{"vocab_id": vocab_id, "quality": quality} for vocab_id, *_, quality in CARDS],
+    })
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "updated": len(CARDS)}
+
+    srs = SRSAlgorithm()
+    for (vocab_id, interval, ease, rep, quality), row in zip(CARDS, card_state(user_id=1)):
+        expected = srs.calculate_next_review(quality, interval, ease, rep)
+        expected_rep = 0 if quality < 3 else rep + 1
+        assert row[0] == vocab_id
+        assert row[1] == expected['new_interval']
+        assert row[2] == pytest.approx(expected['new_ease'])
+        assert row[3] == expected_rep
+        assert row[4] == expected['next_review_date']
+        assert row[5] == quality
+
+def test_answer_batch_rejects_out_of_range_quality(client):
+    seed_cards(user_id=2)
+    before = card_state(user_id=2)
+    for quality in (-1, 6):
+        response = client.post("/answer/batch", json={
+            "user_id": 2,
+            "results": [{"vocab_id": 1, "quality": 4}, {"vocab_id": 2, "quality": quality}],
+        })
+        assert response.status_code == 422
+    # Validasi gagal sebelum handler jalan, jadi tidak ada kartu yang berubah
+    assert card_state(user_id=2) == before
+
+def test_answer_batch_empty(client):
+    response = client.post("/answer/batch", json={"user_id": 3, "results": []})
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "updated": 0}
+
+def test_batch_kernel_matches_scalar():
+    # Cukup besar untuk melewati ambang sm2_kernel (jika Numba terpasang)
+    rng = np.random.default_rng(0)
+    n = _SM2_KERNEL_MIN_BATCH
+    quality = rng.integers(0, 6, n)
+    interval = rng.integers(0, 60, n)
+    ease = rng.uniform(1.3, 3.0, n)
+    rep = rng.integers(0, 8, n)
+
+    srs = SRSAlgorithm()
+    batch = srs.calculate_next_review_batch(quality, interval, ease, rep)
+    for i in range(n):
+        expected = srs.calculate_next_review(int(quality[i]), int(interval[i]), float(ease[i]), int(rep[i]))
+        assert batch['new_interval'][i] == expected['new_interval']
+        assert batch['new_ease'][i] == pytest.approx(expected['new_ease'])
+        assert str(batch['next_review_date'][i]) == expected['next_review_date']
@@ -0,0 +1,155 @@
+# test_cli.py - Tes penulisan batch di cli.py
+import builtins
+import io
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# cli.py mengimpor database_adapter dari root repo
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+import cli
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    # DATABASE relatif terhadap cwd; koneksi bersama CLI dibuka ulang untuk database baru
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, '_CONN', None)
+    monkeypatch.setattr(cli, '_vocab_buffer', [])
+    cli.create_tables()
+    conn = cli._get_conn()
+    yield conn
+    conn.close()
+
+def vocab_rows(n):
+    return [(f'word{i}', f'kata{i}', 'noun', f'Example {i}.', 1.0 + i % 5) for i in range(n)]
+
+def test_add_vocabulary_bulk_returns_ids_in_order(conn):
+    # Lebih dari dua chunk INSERT multi-row, chunk terakhir tidak penuh
+    rows = vocab_rows(2 * cli._VOCAB_ROWS_PER_INSERT + 7)
+    vocab_ids = cli.add_vocabulary_bulk(rows)
+
+    assert len(vocab_ids) == len(rows)
+    stored = conn.execute(
+        'SELECT id, english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score '
+        'FROM vocabulary ORDER BY id'
+    ).fetchall()
+    assert [row[0] for row in stored] == vocab_ids
+    assert [row[1:] for row in stored] == rows
+
+def test_add_vocabulary_bulk_empty(conn):
+    assert cli.add_vocabulary_bulk([]) == []
+    assert conn.execute('SELECT COUNT(*) FROM vocabulary').fetchone()[0] == 0
+
+def test_main_flushes_buffer_on_eof(conn, monkeypatch):
+    answers = iter(['2', 'budi', '1', 'apple', 'apel', 'noun', 'An apple a day.', ''])
+
+    def fake_input(prompt=''):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr(builtins, 'input', fake_input)
+    with pytest.raises(EOFError):
+        cli.main()
+
+    assert conn.execute('SELECT english_word, indonesian_meaning FROM vocabulary').fetchall() == [('apple', 'apel')]
+    assert cli._vocab_buffer == []
+
+def review_rows(user_id, vocab_ids):
+    # Hasil SM-2 per kartu dari jalur skalar, seperti start_review_session
+    srs = cli.SRSAlgorithm()
+    for i, vocab_id in enumerate(vocab_ids):
+        quality, interval, ease, rep = i % 6, i % 20, 1.3 + (i % 13) / 10, i % 4
+        result = srs.calculate_next_review(quality, interval, ease, rep)
+        yield (user_id, vocab_id, '2024-01-01', result['next_review_date'], result['new_interval'],
+               result['new_ease'], quality, 0 if quality < 3 else rep + 1)
+
+def recorded(conn, user_id):
+    return conn.execute(
+        'SELECT vocab_id, review_date, next_review_date, interval_days, ease_factor, performance_score, '
+        'repetition_count, english_word, indonesian_meaning, difficulty_score '
+        'FROM review_sessions WHERE user_id = ? ORDER BY vocab_id', (user_id,)
+    ).fetchall()
+
+def rs_indexes(conn):
+    return {row[1] for row in conn.execute('PRAGMA index_list(review_sessions)')}
+
+@pytest.mark.parametrize('rebuild_indexes', [None, True])
+def test_bulk_record_reviews_matches_single_inserts(conn, rebuild_indexes):
+    vocab_ids = cli.add_vocabulary_bulk(vocab_rows(300))
+
+    # Generator langsung dipakai executemany, tanpa list perantara
+    assert cli.bulk_record_reviews(review_rows(1, vocab_ids), rebuild_indexes=rebuild_indexes) == len(vocab_ids)
+    for row in review_rows(2, vocab_ids):
+        conn.execute(cli._SQL_INSERT_REVIEW, row)
+
+    bulk = recorded(conn, 1)
+    assert len(bulk) == len(vocab_ids)
+    assert bulk == recorded(conn, 2)
+    # Trigger insert tetap mengisi salinan kosakata saat index sedang di-drop
+    assert all(row[7] is not None for row in bulk)
+
+    # Semua index sekunder ada lagi setelah impor, dengan atau tanpa rebuild
+    assert set(cli.RS_INDEXES) <= rs_indexes(conn)
+
+def test_bulk_record_reviews_rebuild_threshold(conn, monkeypatch):
+    vocab_ids = cli.add_vocabulary_bulk(vocab_rows(3))
+    executed = []
+    conn.set_trace_callback(executed.append)
+    monkeypatch.setattr(cli, 'BULK_REINDEX_MIN_ROWS', 3)
+
+    cli.bulk_record_reviews(list(review_rows(1, vocab_ids[:2])))
+    assert not any(sql.startswith('DROP INDEX') for sql in executed)
+
+    cli.bulk_record_reviews(list(review_rows(2, vocab_ids)))
+    assert sum(sql.startswith('DROP INDEX') for sql in executed) == len(cli.RS_INDEXES)
+    conn.set_trace_callback(None)
+
+@pytest.mark.parametrize('rebuild_indexes', [False, True])
+def test_bulk_record_reviews_rolls_back_on_error(conn, rebuild_indexes):
+    vocab_ids = cli.add_vocabulary_bulk(vocab_rows(3))
+    rows = list(review_rows(1, vocab_ids))
+    rows.append(rows[0][:-1])  # baris terakhir kurang satu kolom
+
+    with pytest.raises(sqlite3.Error):
+        cli.bulk_record_reviews(rows, rebuild_indexes=rebuild_indexes)
+
+    assert conn.execute('SELECT COUNT(*) FROM review_sessions').fetchone()[0] == 0
+    assert set(cli.RS_INDEXES) <= rs_indexes(conn)
+
+@pytest.mark.parametrize('write', [
+    lambda: cli.bulk_record_reviews([(1, 1, '2024-01-01', '2024-01-02', 1, 2.5, 4, 1)]),
+    lambda: cli.add_vocabulary_bulk(vocab_rows(1)),
+])
+def test_bulk_writes_keep_busy_error(conn, write):
+    # Penulis lain memegang write lock, jadi BEGIN IMMEDIATE gagal tanpa membuka transaksi
+    other = sqlite3.connect(cli.DATABASE, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    conn.execute('PRAGMA busy_timeout = 0')
+    try:
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            write()
+    finally:
+        other.execute('ROLLBACK')
+        other.close()
+
+def test_read_quality_reprompts_until_valid(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('abc\n6\n-1\n\n4\n'))
+    assert cli.read_quality() == 4
+    assert capsys.readouterr().out.count('Please enter a number from 0 to 5') == 4
+
+def test_read_quality_eof(monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('7\n'))
+    with pytest.raises(EOFError):
+        cli.read_quality()
+
+@pytest.mark.parametrize('quality', [-1, 6])
+def test_calculate_next_review_rejects_out_of_range_quality(quality):
+    with pytest.raises(ValueError):
+        cli.SRSAlgorithm().calculate_next_review(quality, 1, 2.5, 0)
@@ -0,0 +1,96 @@
+# test_schema_migration.py - Tes migrasi skema bersama (db.migrate) dan trigger salinan kosakata
+import sqlite3
+
+import pytest
+
+import main
+from config import DATABASE
+from db import SCHEMA_VERSION
+from review_scheduler import DueCard, _SQL_DUE_VOCABULARY, load_due_vocabulary
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    # DATABASE relatif terhadap cwd, jadi setiap tes memakai database baru
+    monkeypatch.chdir(tmp_path)
+    main.create_tables()
+    conn = sqlite3.connect(DATABASE, isolation_level=None)
+    yield conn
+    conn.close()
+
+def seed(conn):
+    conn.execute("INSERT INTO users (id, username) VALUES (1, 'budi')")
+    conn.executemany(
+        "INSERT INTO vocabulary (id, english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(1, 'apple', 'apel', 'noun', 'An apple a day.', 1.0),
+         (2, 'run', 'lari', 'verb', 'I run daily.', 2.0)],
+    )
+    conn.execute(
+        "INSERT INTO review_sessions (user_id, vocab_id, next_review_date, interval_days, ease_factor, repetition_count) "
+        "VALUES (1, 1, '2000-01-01', 1, 2.5, 0)"
+    )
+
+def copied(conn, rs_id=1):
+    return conn.execute(
+        "SELECT english_word, indonesian_meaning, part_of_speech, example_sentence, difficulty_score "
+        "FROM review_sessions WHERE id = ?", (rs_id,)
+    ).fetchone()
+
+def test_main_schema_serves_load_due_vocabulary(conn):
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    seed(conn)
+
+    due = load_due_vocabulary(1)
+    assert [(card.vocab_id, card.english_word, card.indonesian_meaning) for card in due] == [(1, 'apple', 'apel')]
+
+def test_due_card_fields_match_query_columns(conn):
+    cursor = conn.execute(_SQL_DUE_VOCABULARY, (1, '2000-01-01', '2000-01-01'))
+    assert tuple(column[0] for column in cursor.description) == DueCard._fields
+
+def test_insert_trigger_copies_vocabulary(conn):
+    seed(conn)
+    assert copied(conn) == ('apple', 'apel', 'noun', 'An apple a day.', 1.0)
+
+def test_vocabulary_update_trigger(conn):
+    seed(conn)
+    conn.execute("UPDATE vocabulary SET indonesian_meaning = 'buah apel', difficulty_score = 3.0 WHERE id = 1")
+    assert copied(conn) == ('apple', 'buah apel', 'noun', 'An apple a day.', 3.0)
+
+def test_relink_trigger(conn):
+    seed(conn)
+    conn.execute("UPDATE review_sessions SET vocab_id = 2 WHERE id = 1")
+    assert copied(conn) == ('run', 'lari', 'verb', 'I run daily.', 2.0)
+
+def test_vocabulary_delete_trigger(conn):
+    seed(conn)
+    conn.execute("DELETE FROM vocabulary WHERE id = 1")
+    assert copied(conn) == (None, None, None, None, None)
+    # Sama seperti JOIN ke vocabulary: kartu tanpa kosakata tidak masuk antrian due
+    assert load_due_vocabulary(1) == []
+
+def test_migrate_upgrades_version_2_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Skema main.py versi 2: review_sessions belum punya salinan kolom kosakata
+    conn = sqlite3.connect(DATABASE, isolation_level=None)
+    conn.executescript('''
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, created_date DATE);
+        CREATE TABLE vocabulary (id INTEGER PRIMARY KEY, english_word TEXT, indonesian_meaning TEXT,
+                                 part_of_speech TEXT, example_sentence TEXT, difficulty_score FLOAT DEFAULT 1.0);
+        CREATE TABLE review_sessions (id INTEGER PRIMARY KEY, user_id INTEGER, vocab_id INTEGER,
+                                      review_date TIMESTAMP, next_review_date TIMESTAMP, interval_days INTEGER,
+                                      ease_factor FLOAT DEFAULT 2.5, performance_score INTEGER,
+                                      repetition_count INTEGER DEFAULT 0);
+        INSERT INTO users (id, username) VALUES (1, 'budi');
+        INSERT INTO vocabulary VALUES (1, 'apple', 'apel', 'noun', 'An apple a day.', 1.0);
+        INSERT INTO review_sessions (user_id, vocab_id, next_review_date, interval_days, ease_factor, repetition_count)
+            VALUES (1, 1, '2000-01-01', 1, 2.5, 0);
+        PRAGMA user_version = 2;
+    ''')
+
+    main.create_tables_if_needed()
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert copied(conn) == ('apple', 'apel', 'noun', 'An apple a day.', 1.0)
+    triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert triggers == {'trg_rs_vocab_insert', 'trg_rs_vocab_relink', 'trg_vocab_update', 'trg_vocab_delete'}
+    conn.close()
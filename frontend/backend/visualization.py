@@ -1,61 +1,32 @@
 import matplotlib.pyplot as plt
-import sqlite3
+import numpy as np
 from datetime import datetime, timedelta
+from db import srs_conn
 
 def plot_review_schedule(user_id, db_path='vocabulary_app.db'):
     '''Plot jumlah review per hari untuk 30 hari ke depan'''
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Query data
-    cursor.execute('''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        GROUP BY next_review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT next_review_date, COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = ? 
-        GROUP BY next_review_date
-    ''', (user_id,))
-    
-    data = cursor.fetchall()
-    conn.close()
-    
-    # Proses data
-    dates = [row[0] for row in data]
-    counts = [row[1] for row in data]
+    with srs_conn(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = 1000
+    
+        # Binning per tanggal dilakukan di SQL, jadi hanya satu baris per hari
+        # (maksimal 31) yang dikirim ke Python
+        today = datetime.now().date()
+        cursor.execute('''
+            SELECT date(next_review_date) AS d, COUNT(*)
+            FROM review_sessions
+            WHERE user_id = ?
+              AND next_review_date >= ? AND date(next_review_date) <= ?
+            GROUP BY d
+            ORDER BY d
+        ''', (user_id, today.isoformat(), (today + timedelta(days=30)).isoformat()))
+    
+        # Baris langsung dialirkan dari cursor ke array NumPy tanpa list perantara;
+        # datetime64 dipakai matplotlib tanpa parsing string tanggal
+        data = np.fromiter(cursor, dtype=[('date', 'datetime64[D]'), ('count', np.int32)])
+    
+    dates = data['date']
+    counts = data['count']
     
     # Plot
     plt.figure(figsize=(10, 5))
@@ -69,72 +40,37 @@ def plot_review_schedule(user_id, db_path='vocabulary_app.db'):
 
 def plot_retention_curve(user_id, db_path='vocabulary_app.db'):
     '''Plot retensi berdasarkan performa review'''
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        ORDER BY review_date
-    ''' if db_adapter.is_postgresql else '''
-        SELECT review_date, performance_score 
-        FROM review_sessions 
-        WHERE user_id = ? 
-        ORDER BY review_date
-    ''', (user_id,))
-    
-    data = cursor.fetchall()
-    conn.close()
-    
-    if not data:
+    with srs_conn(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = 1000
+    
+        # Retensi kumulatif dihitung di SQL (window function) dan hanya sampel
+        # setiap 5 review (plus review terakhir) yang dikirim ke Python.
+        # Score 3-5 dianggap berhasil.
+        cursor.execute('''
+            SELECT substr(review_date, 1, 10), retention
+            FROM (
+                SELECT review_date,
+                       100.0 * SUM(CASE WHEN performance_score >= 3 THEN 1 ELSE 0 END) OVER w
+                             / ROW_NUMBER() OVER w AS retention,
+                       ROW_NUMBER() OVER w AS rn,
+                       COUNT(*) OVER () AS total
+                FROM review_sessions
+                WHERE user_id = ?
+                WINDOW w AS (ORDER BY review_date, id ROWS UNBOUNDED PRECEDING)
+            )
+            WHERE (rn - 1) % 5 = 0 OR rn = total
+            ORDER BY rn
+        ''', (user_id,))
+    
+        data = np.fromiter(cursor, dtype=[('date', 'U10'), ('retention', np.float64)])
+    
+    if data.size == 0:
         print("Tidak ada data untuk user ini.")
         return
     
-    # Hitung retensi kumulatif
-    dates = []
-    retention_rates = []
-    total_correct = 0
-    total_reviews = 0
-    
-    for i, (date, score) in enumerate(data):
-        total_reviews += 1
-        if score >= 3:  # Score 3-5 dianggap berhasil
-            total_correct += 1
-        
-        if i % 5 == 0 or i == len(data) - 1:  # Ambil sampel setiap 5 review
-            dates.append(date[:10])  # Ambil hanya tanggal
-            retention_rates.append((total_correct / total_reviews) * 100)
+    dates = data['date']
+    retention_rates = data['retention']
     
     # Plot
     plt.figure(figsize=(10, 5))
@@ -148,127 +84,22 @@ def plot_retention_curve(user_id, db_path='vocabulary_app.db'):
 
 def generate_report(user_id, db_path='vocabulary_app.db'):
     '''Generate laporan statistik sederhana'''
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Query statistik
-    cursor.execute('SELECT COUNT(*) FROM review_sessions WHERE user_id = %s' if db_adapter.is_postgresql else 'SELECT COUNT(*) FROM review_sessions WHERE user_id = ?', (user_id,))
-    total_reviews = cursor.fetchone()[0]
-    
-    cursor.execute('''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = %s AND performance_score >= 3
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(DISTINCT vocab_id) 
-        FROM review_sessions 
-        WHERE user_id = ? AND performance_score >= 3
-    ''', (user_id,))
-    mastered_words = cursor.fetchone()[0]
-    
-    cursor.execute('''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT AVG(ease_factor) 
-        FROM review_sessions 
-        WHERE user_id = ?
-    ''', (user_id,))
-    avg_ease = cursor.fetchone()[0] or 0
-    
-    cursor.execute('''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = %s 
-        AND next_review_date <= date('now')
-    ''' if db_adapter.is_postgresql else '''
-        SELECT COUNT(*) 
-        FROM review_sessions 
-        WHERE user_id = ? 
-        AND next_review_date <= date('now')
-    ''', (user_id,))
-    due_cards = cursor.fetchone()[0]
+    with srs_conn(db_path) as conn:
+        cursor = conn.cursor()
+    
+        # Semua statistik dalam satu query (satu kali lewat baris milik user)
+        cursor.execute('''
+            SELECT COUNT(*),
+                   COUNT(DISTINCT CASE WHEN performance_score >= 3 THEN vocab_id END),
+                   AVG(ease_factor),
+                   SUM(CASE WHEN next_review_date <= date('now') THEN 1 ELSE 0 END)
+            FROM review_sessions
+            WHERE user_id = ?
+        ''', (user_id,))
+        total_reviews, mastered_words, avg_ease, due_cards = cursor.fetchone()
+        avg_ease = avg_ease or 0
+        due_cards = due_cards or 0
     
-    conn.close()
     
     # Print report
     print("\n" + "="*50)
@@ -1,13 +1,20 @@
-import sqlite3
 import os
+import sys
+
+# Helper koneksi SQLite bersama (db.get_conn) ada di frontend/backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'backend'))
+from db import get_conn
 
 def init_database():
     # Hapus file lama jika ingin fresh start (opsional)
     # if os.path.exists('srs_vocab.db'):
     #     os.remove('srs_vocab.db')
     
-    conn = sqlite3.connect('srs_vocab.db')
+    conn = get_conn('srs_vocab.db')
     cursor = conn.cursor()
+
+    # Semua DDL dan data contoh dalam satu transaksi (satu commit, satu fsync)
+    cursor.execute("BEGIN IMMEDIATE")
     
     # 1. TABLE words (untuk vocabulary)
     cursor.execute('''
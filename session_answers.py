@@ -0,0 +1,56 @@
+# session_answers.py - Simpan semua jawaban satu sesi sekaligus (/api/session/answers/bulk)
+from database_adapter import db_adapter
+
+REQUIRED_FIELDS = ('word_id', 'user_answer', 'correct', 'response_time')
+
+_SQL_INSERT_ANSWER_SQLITE = '''
+    INSERT INTO user_answers
+    (session_token, word_id, user_answer, correct, response_time)
+    VALUES (?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_ANSWER_PG = _SQL_INSERT_ANSWER_SQLITE.replace('?', '%s')
+
+def validate_bulk_answers(data):
+    """
+    Cek bentuk payload bulk.
+
+    Returns:
+    - string pesan error, atau None jika payload valid
+    """
+    answers = data.get('answers') if data else None
+    if not data or 'session_token' not in data or not isinstance(answers, list) or not answers:
+        return "Expected session_token and a non-empty answers list"
+
+    for i, answer in enumerate(answers):
+        if not isinstance(answer, dict):
+            return f"Answer {i} must be an object"
+        for field in REQUIRED_FIELDS:
+            if field not in answer:
+                return f"Missing field in answer {i}: {field}"
+    return None
+
+def save_answers_bulk(cursor, session_token, answers):
+    """
+    Cek session_token dan semua word_id (satu query), lalu insert semua jawaban
+    dengan satu executemany. Commit/rollback diurus pemanggil.
+
+    Returns:
+    - tuple (jumlah baris, None), atau (0, pesan error) jika token/word_id tidak valid
+    """
+    placeholder = '%s' if db_adapter.is_postgresql else '?'
+
+    cursor.execute(f'SELECT 1 FROM learning_sessions WHERE session_token = {placeholder}', (session_token,))
+    if not cursor.fetchone():
+        return 0, "Invalid session_token"
+
+    word_ids = list({answer['word_id'] for answer in answers})
+    cursor.execute(f'SELECT COUNT(*) FROM words WHERE id IN ({", ".join([placeholder] * len(word_ids))})', word_ids)
+    if cursor.fetchone()[0] != len(word_ids):
+        return 0, "Invalid word_id"
+
+    rows = [
+        (session_token, answer['word_id'], answer['user_answer'], bool(answer['correct']), float(answer['response_time']))
+        for answer in answers
+    ]
+    cursor.executemany(_SQL_INSERT_ANSWER_PG if db_adapter.is_postgresql else _SQL_INSERT_ANSWER_SQLITE, rows)
+    return len(rows), None
@@ -1,5 +1,112 @@
+from collections import namedtuple
 from datetime import datetime, timedelta, date
 import difflib
+from functools import lru_cache
+
+from database_adapter import db_adapter
+
+# RapidFuzz (C++) is much faster than difflib; fall back to difflib when it is not installed
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+
+# One due card as returned by get_due_vocab; fields follow the SELECT column names
+# below (test_due_card.py checks them against cursor.description)
+DueCard = namedtuple('DueCard', [
+    'vocab_id', 'english_word', 'indonesian_meaning', 'part_of_speech', 'example_sentence',
+    'difficulty_score', 'next_review_date', 'ease_factor', 'interval_days', 'repetition_count',
+])
+
+_SQL_DUE_CARDS_SQLITE = '''
+    SELECT v.id AS vocab_id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
+           rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
+    FROM vocabulary v
+    JOIN review_sessions rs ON v.id = rs.vocab_id
+    WHERE rs.user_id = ? AND rs.next_review_date <= ?
+    ORDER BY
+        CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,
+        rs.next_review_date ASC,
+        v.difficulty_score DESC,
+        rs.ease_factor ASC
+'''
+_SQL_DUE_CARDS_PG = _SQL_DUE_CARDS_SQLITE.replace('?', '%s')
+
+# SM-2: perubahan ease hanya bergantung pada quality 0-5, jadi dihitung sekali di sini
+_EASE_DELTA = tuple(0.1 - (5 - q) * (0.08 + (5 - q) * 0.02) for q in range(6))
+
+# Interval tetap untuk repetisi pertama dan kedua (sama dengan frontend/backend/srs.py)
+_INTERVAL_FOR_REP = {1: 1, 2: 6}
+
+
+def _srs_kernel(correct, current_interval, ease_factor, repetitions):
+    """Scalar simplified SM-2 step shared by calculate_srs and the batch kernel."""
+    if correct:
+        repetitions += 1
+        if repetitions == 1:
+            new_interval = 1  # 1 minute for first correct
+        elif repetitions == 2:
+            new_interval = 3  # 3 minutes for second correct
+        else:
+            new_interval = round(current_interval * ease_factor)
+
+        new_ease_factor = min(ease_factor + 0.1, 3.0)
+    else:
+        repetitions = 0
+        new_interval = max(1, current_interval // 2)  # Reset to 1 minute or half current
+        new_ease_factor = max(1.3, ease_factor - 0.2)
+
+    return new_interval, new_ease_factor, repetitions
+
+
+# NumPy and the optional Numba are only needed by calculate_srs_batch, so they are
+# imported on its first call (see _load_srs_batch) instead of when the app starts
+np = None
+prange = None
+_srs_kernel_jit = None
+_srs_batch = None
+
+
+def _srs_batch_loop(correct, current_interval, ease_factor, repetitions):
+    n = correct.shape[0]
+    new_interval = np.empty(n, dtype=np.int64)
+    new_ease = np.empty(n, dtype=np.float64)
+    new_reps = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        new_interval[i], new_ease[i], new_reps[i] = _srs_kernel_jit(
+            correct[i], current_interval[i], ease_factor[i], repetitions[i]
+        )
+    return new_interval, new_ease, new_reps
+
+
+def _srs_batch_numpy(correct, current_interval, ease_factor, repetitions):
+    new_reps = np.where(correct, repetitions + 1, 0)
+    grown = np.rint(current_interval * ease_factor).astype(np.int64)
+    new_interval = np.where(
+        correct,
+        np.where(new_reps == 1, 1, np.where(new_reps == 2, 3, grown)),
+        np.maximum(1, current_interval // 2),
+    )
+    new_ease = np.where(correct, np.minimum(ease_factor + 0.1, 3.0), np.maximum(1.3, ease_factor - 0.2))
+    return new_interval, new_ease, new_reps
+
+
+def _load_srs_batch():
+    """Import NumPy (and Numba when installed) and pick the batch kernel, once."""
+    global np, prange, _srs_kernel_jit, _srs_batch
+    import numpy as np
+    try:
+        from numba import njit, prange
+    except ImportError:
+        _srs_batch = _srs_batch_numpy
+    else:
+        # Only the batch path is compiled: for a single card the dispatch cost of a
+        # jitted call is about the same as running the interpreted kernel
+        _srs_kernel_jit = njit(cache=True)(_srs_kernel)
+        _srs_batch = njit(cache=True, parallel=True)(_srs_batch_loop)
+    return _srs_batch
+
 
 class SRSAlgorithm:
     def __init__(self):
@@ -18,24 +125,28 @@ class SRSAlgorithm:
         Returns:
         - tuple: (new_interval, new_ease_factor, new_repetitions)
         """
-        if correct:
-            # Correct answer
-            repetitions += 1
-            if repetitions == 1:
-                new_interval = 1  # 1 minute for first correct
-            elif repetitions == 2:
-                new_interval = 3  # 3 minutes for second correct
-            else:
-                new_interval = round(current_interval * ease_factor)
-
-            new_ease_factor = min(ease_factor + 0.1, 3.0)
-        else:
-            # Incorrect answer
-            repetitions = 0
-            new_interval = max(1, current_interval // 2)  # Reset to 1 minute or half current
-            new_ease_factor = max(1.3, ease_factor - 0.2)
+        return _srs_kernel(correct, current_interval, ease_factor, repetitions)
+
+    def calculate_srs_batch(self, correct, current_interval, ease_factor, repetitions):
+        """
+        Vectorized calculate_srs for offline analytics over many cards.
 
-        return new_interval, new_ease_factor, repetitions
+        Parameters:
+        - correct: array-like of booleans
+        - current_interval: array-like of integers (minutes)
+        - ease_factor: array-like of floats
+        - repetitions: array-like of integers
+
+        Returns:
+        - tuple of numpy arrays: (new_interval, new_ease_factor, new_repetitions)
+        """
+        srs_batch = _srs_batch or _load_srs_batch()
+        return srs_batch(
+            np.asarray(correct, dtype=np.bool_),
+            np.asarray(current_interval, dtype=np.int64),
+            np.asarray(ease_factor, dtype=np.float64),
+            np.asarray(repetitions, dtype=np.int64),
+        )
 
     def fuzzy_match(self, user_answer: str, correct_answer: str, threshold: float = 0.8):
         """
@@ -56,7 +167,16 @@ class SRSAlgorithm:
         if user_clean == correct_clean:
             return True
 
-        # Fuzzy matching using difflib
+        # Length prefilter: both ratios are 2*matches/(len_a+len_b) and matches <= the shorter
+        # length, so answers whose lengths differ too much can be rejected without any alignment
+        len_user, len_correct = len(user_clean), len(correct_clean)
+        if 2 * min(len_user, len_correct) < threshold * (len_user + len_correct):
+            return False
+
+        # Fuzzy matching; score_cutoff lets RapidFuzz stop early once the threshold is unreachable
+        if fuzz is not None:
+            return fuzz.ratio(user_clean, correct_clean, score_cutoff=threshold * 100) >= threshold * 100
+
         similarity = difflib.SequenceMatcher(None, user_clean, correct_clean).ratio()
         return similarity >= threshold
 
@@ -71,21 +191,13 @@ class SRSAlgorithm:
         """
         Legacy SM-2 implementation for backward compatibility.
         """
-        if quality_response < 3:
-            repetition_count = 0
-            interval = 1
-        else:
-            repetition_count += 1
-            if repetition_count == 1:
-                interval = 1
-            elif repetition_count == 2:
-                interval = 6
-            else:
-                interval = round(current_interval * current_ease)
-
-        ease_factor = current_ease + (0.1 - (5 - quality_response) * (0.08 + (5 - quality_response) * 0.02))
-        if ease_factor < 1.3:
-            ease_factor = 1.3
+        # Dicek sebelum _sm2_math: quality adalah indeks _EASE_DELTA dan hasilnya di-cache
+        if not 0 <= quality_response <= 5:
+            raise ValueError(f"quality_response harus 0-5, bukan {quality_response!r}")
+
+        interval, ease_factor, repetition_count = self._sm2_math(
+            quality_response, current_interval, current_ease, repetition_count
+        )
 
         today = datetime.now()
         next_review_date = today + timedelta(minutes=interval)  # Changed to minutes
@@ -97,6 +209,28 @@ class SRSAlgorithm:
             'next_review_date': next_review_date.isoformat()
         }
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sm2_math(quality_response: int, current_interval: int, current_ease: float, repetition_count: int):
+        """
+        Pure SM-2 arithmetic, memoized on its arguments.
+
+        Returns:
+        - tuple: (new_interval, new_ease_factor, new_repetition_count)
+        """
+        if quality_response < 3:
+            repetition_count = 0
+            interval = 1
+        else:
+            repetition_count += 1
+            interval = _INTERVAL_FOR_REP.get(repetition_count) or round(current_interval * current_ease)
+
+        ease_factor = current_ease + _EASE_DELTA[quality_response]
+        if ease_factor < 1.3:
+            ease_factor = 1.3
+
+        return interval, ease_factor, repetition_count
+
     def get_due_vocab(self, user_id: int, db_conn):
         """
         Mengembalikan kosakata yang next_review_date <= hari ini untuk user tertentu.
@@ -106,114 +240,15 @@ class SRSAlgorithm:
         - db_conn: database connection
 
         Returns:
-        - list of dictionaries: [{'vocab_id': id, 'english_word': word, ...}, ...]
+        - list of DueCard: [DueCard(vocab_id=id, english_word=word, ...), ...]
         """
         cursor = db_conn.cursor()
 
         today = date.today().isoformat()
-        cursor.execute('''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-            ORDER BY
-                CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-            ORDER BY
-                CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-            ORDER BY
-                CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-            ORDER BY
-                CASE WHEN rs.next_review_date < %s THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= %s
-            ORDER BY
-                CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = ? AND rs.next_review_date <= ?
-            ORDER BY
-                CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = %s AND rs.next_review_date <= ?
-            ORDER BY
-                CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''' if db_adapter.is_postgresql else '''
-            SELECT v.id, v.english_word, v.indonesian_meaning, v.part_of_speech, v.example_sentence, v.difficulty_score,
-                   rs.next_review_date, rs.ease_factor, rs.interval_days, rs.repetition_count
-            FROM vocabulary v
-            JOIN review_sessions rs ON v.id = rs.vocab_id
-            WHERE rs.user_id = ? AND rs.next_review_date <= ?
-            ORDER BY
-                CASE WHEN rs.next_review_date < ? THEN 0 ELSE 1 END,
-                rs.next_review_date ASC,
-                v.difficulty_score DESC,
-                rs.ease_factor ASC
-        ''', (user_id, today, today))
-
-        due_vocab = []
-        for row in cursor.fetchall():
-            due_vocab.append({
-                'vocab_id': row[0],
-                'english_word': row[1],
-                'indonesian_meaning': row[2],
-                'part_of_speech': row[3],
-                'example_sentence': row[4],
-                'difficulty_score': row[5],
-                'next_review_date': row[6],
-                'ease_factor': row[7],
-                'interval_days': row[8],
-                'repetition_count': row[9]
-            })
-
-        return due_vocab
+        cursor.execute(
+            _SQL_DUE_CARDS_PG if db_adapter.is_postgresql else _SQL_DUE_CARDS_SQLITE,
+            (user_id, today, today),
+        )
+
+        # Column order matches DueCard, so each row maps positionally without building a dict
+        return [DueCard._make(row) for row in cursor]
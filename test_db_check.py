@@ -9,9 +9,6 @@ import json
 import time
 from datetime import datetime
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 def test_database_resilience():
     """Test the database resilience module"""
     print("🧪 Testing Database Resilience Module")
@@ -59,8 +56,8 @@ def test_database_resilience():
         traceback.print_exc()
         return False
 
-def test_health_endpoint():
-    """Test the health endpoint"""
+def test_health_endpoint(body=True):
+    """Test the health endpoint; body=False only checks the status code via HEAD"""
     print("\n🏥 Testing Health Endpoint")
     print("=" * 30)
 
@@ -69,6 +66,12 @@ def test_health_endpoint():
         from app import app
 
         with app.test_client() as client:
+            # Fast path for frequent probes: no JSON to build or parse
+            if not body:
+                response = client.head('/health')
+                print(f"Status Code: {response.status_code}")
+                return response.status_code == 200
+
             # Test health endpoint
             response = client.get('/health')
             data = response.get_json()
@@ -88,6 +91,11 @@ def test_health_endpoint():
         return False
 
 if __name__ == '__main__':
+    # Add current directory to path for imports (pytest already does this when collecting)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
     print(f"🕐 Test started at {datetime.now().isoformat()}")
     print(f"🐍 Python: {sys.version}")
     print(f"📁 Working directory: {os.getcwd()}")
@@ -6,6 +6,16 @@ Test script to verify database compatibility fixes
 from database_adapter import db_adapter
 import os
 
+# Diset sekali untuk koneksi bersama, bukan per tes
+SQLITE_PRAGMAS = ('foreign_keys=ON', 'cache_size=-65536')
+
+def init_adapter():
+    """Buka koneksi bersama db_adapter sekali dan set PRAGMA SQLite"""
+    db_adapter.get_connection()
+    if not db_adapter.is_postgresql:
+        for pragma in SQLITE_PRAGMAS:
+            db_adapter.execute(f'PRAGMA {pragma}')
+
 def test_database_adapter():
     """Test the database adapter functionality"""
     print("🧪 Testing Database Adapter Compatibility")
@@ -55,11 +65,15 @@ def test_database_adapter():
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        db_adapter.close()
         return False
 
     return True
 
 if __name__ == '__main__':
-    success = test_database_adapter()
+    # Koneksi bersama hanya ditutup sekali, setelah semua tes selesai
+    try:
+        init_adapter()
+        success = test_database_adapter()
+    finally:
+        db_adapter.close()
     exit(0 if success else 1)
@@ -4,19 +4,77 @@ Deployment Testing Script for Railway
 Tests all critical endpoints and functionality
 """
 
-import requests
+import asyncio
+import httpx
 import json
+import shutil
+import subprocess
 import sys
 import time
 from datetime import datetime
+from pathlib import Path
 
-def test_endpoint(url, endpoint, expected_status=200, timeout=10):
+# HTTP/2 multiplexes every probe over one connection; it needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# `railway domain` is slow to start, so its answer is reused for 10 minutes
+RAILWAY_URL_CACHE = Path.home() / ".cache" / "mindspark_railway_url"
+RAILWAY_URL_TTL = 600
+
+# Retry transient failures (Railway cold starts): waits 0.5s, 1s, 2s, 4s between attempts
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Upper bound on concurrent probes so a growing endpoint list cannot exhaust Railway's connection limit
+MAX_CONCURRENT_PROBES = 10
+
+# Successful responses are reused for this many seconds (keyed by full URL)
+CACHE_TTL = 30.0
+_response_cache = {}
+
+def clear_response_cache():
+    """Drop cached responses so the next test pass hits the server again"""
+    _response_cache.clear()
+
+def make_client(timeout=10):
+    """One async client shared by all probes (keep-alive, HTTP/2 when available)"""
+    return httpx.AsyncClient(http2=HTTP2, timeout=timeout)
+
+async def get_cached(client, full_url):
+    """get_with_retry, reusing a successful response younger than CACHE_TTL"""
+    cached = _response_cache.get(full_url)
+    if cached is not None and time.monotonic() - cached[0] < CACHE_TTL:
+        return cached[1]
+
+    response = await get_with_retry(client, full_url)
+    if response.is_success:
+        _response_cache[full_url] = (time.monotonic(), response)
+    return response
+
+async def get_with_retry(client, full_url):
+    """GET with exponential backoff on connection errors and 502/503/504"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.get(full_url)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+async def test_endpoint(client, url, endpoint, expected_status=200):
     """Test a single endpoint"""
     try:
         full_url = url.rstrip('/') + endpoint
         print(f"🔍 Testing {endpoint}...")
 
-        response = requests.get(full_url, timeout=timeout)
+        response = await get_cached(client, full_url)
 
         if response.status_code == expected_status:
             print(f"✅ {endpoint}: {response.status_code}")
@@ -25,13 +83,13 @@ def test_endpoint(url, endpoint, expected_status=200, timeout=10):
             print(f"❌ {endpoint}: {response.status_code} (expected {expected_status})")
             return False, response
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ {endpoint}: Connection failed - {e}")
         return False, None
 
-def test_health_endpoint(url):
+async def test_health_endpoint(client, url):
     """Test health endpoint specifically"""
-    success, response = test_endpoint(url, "/api/health")
+    success, response = await test_endpoint(client, url, "/api/health")
     if success and response:
         try:
             data = response.json()
@@ -48,9 +106,9 @@ def test_health_endpoint(url):
             return False
     return success
 
-def test_frontend(url):
+async def test_frontend(client, url):
     """Test if frontend loads"""
-    success, response = test_endpoint(url, "/", expected_status=200)
+    success, response = await test_endpoint(client, url, "/", expected_status=200)
     if success and response:
         content = response.text.lower()
         if "mindspark" in content or "flask" in content or "html" in content:
@@ -61,7 +119,7 @@ def test_frontend(url):
             return True
     return success
 
-def test_api_endpoints(url):
+async def test_api_endpoints(client, url):
     """Test various API endpoints"""
     endpoints = [
         ("/api/test", 200),
@@ -70,23 +128,49 @@ def test_api_endpoints(url):
         ("/api/learn", 200),
     ]
 
-    results = []
-    for endpoint, expected_status in endpoints:
-        success, _ = test_endpoint(url, endpoint, expected_status)
-        results.append(success)
+    # Sliding window: at most MAX_CONCURRENT_PROBES requests in flight; a new
+    # probe starts as soon as one finishes
+    window = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+    async def probe(endpoint, expected_status):
+        async with window:
+            return await test_endpoint(client, url, endpoint, expected_status)
+
+    probes = await asyncio.gather(
+        *(probe(endpoint, expected_status) for endpoint, expected_status in endpoints),
+        return_exceptions=True,
+    )
+    return [not isinstance(probe, BaseException) and probe[0] for probe in probes]
+
+def get_railway_url():
+    """`railway domain` output, cached for RAILWAY_URL_TTL seconds; None if unavailable"""
+    try:
+        if time.time() - RAILWAY_URL_CACHE.stat().st_mtime < RAILWAY_URL_TTL:
+            return RAILWAY_URL_CACHE.read_text().strip()
+    except OSError:
+        pass
+
+    # Resolve the executable (railway.cmd on Windows) so no shell is needed
+    railway = shutil.which("railway")
+    if railway is None:
+        return None
+    result = subprocess.run([railway, "domain"], capture_output=True, text=True)
+    url = result.stdout.strip()
+    if result.returncode != 0 or not url:
+        return None
 
-    return results
+    RAILWAY_URL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    RAILWAY_URL_CACHE.write_text(url)
+    return url
 
-def main():
+async def main(verbose=False):
     print("🚀 Railway Deployment Testing Script")
     print("=" * 50)
 
     # Get Railway URL
     try:
-        import subprocess
-        result = subprocess.run(["railway", "domain"], capture_output=True, text=True, shell=True)
-        if result.returncode == 0:
-            url = result.stdout.strip()
+        url = get_railway_url()
+        if url:
             print(f"📡 Detected Railway URL: {url}")
         else:
             print("❌ Could not get Railway URL automatically")
@@ -109,55 +193,67 @@ def main():
 
     # Test sequence
     tests = [
-        ("Health Check", lambda: test_health_endpoint(url)),
-        ("Frontend Load", lambda: test_frontend(url)),
-        ("API Endpoints", lambda: test_api_endpoints(url)),
+        ("Health Check", test_health_endpoint),
+        ("Frontend Load", test_frontend),
+        ("API Endpoints", test_api_endpoints),
     ]
 
     results = []
-    for test_name, test_func in tests:
-        print(f"\n📋 {test_name}:")
-        try:
-            result = test_func()
-            if isinstance(result, list):
-                success_count = sum(result)
-                total_count = len(result)
-                print(f"   Results: {success_count}/{total_count} endpoints working")
-                results.append(success_count > 0)  # At least one endpoint works
-            else:
-                results.append(result)
-        except Exception as e:
-            print(f"   ❌ Test failed with error: {e}")
-            results.append(False)
-
-    # Summary
-    print("\n" + "=" * 50)
-    print("📊 DEPLOYMENT TEST SUMMARY")
-    print("=" * 50)
+    clear_response_cache()
+    async with make_client() as client:
+        for test_name, test_func in tests:
+            print(f"\n📋 {test_name}:")
+            try:
+                result = await test_func(client, url)
+                if isinstance(result, list):
+                    success_count = sum(result)
+                    total_count = len(result)
+                    print(f"   Results: {success_count}/{total_count} endpoints working")
+                    results.append(success_count > 0)  # At least one endpoint works
+                else:
+                    results.append(result)
+            except Exception as e:
+                print(f"   ❌ Test failed with error: {e}")
+                results.append(False)
 
     total_tests = len(results)
     passed_tests = sum(results)
 
-    for i, (test_name, _) in enumerate(tests):
-        status = "✅ PASS" if results[i] else "❌ FAIL"
-        print(f"{test_name}: {status}")
+    # Human-readable summary only with --verbose
+    if verbose:
+        print("\n" + "=" * 50)
+        print("📊 DEPLOYMENT TEST SUMMARY")
+        print("=" * 50)
+
+        for i, (test_name, _) in enumerate(tests):
+            status = "✅ PASS" if results[i] else "❌ FAIL"
+            print(f"{test_name}: {status}")
 
-    print(f"\n🎯 Overall: {passed_tests}/{total_tests} tests passed")
+        print(f"\n🎯 Overall: {passed_tests}/{total_tests} tests passed")
+
+        if passed_tests == total_tests:
+            print("🎉 DEPLOYMENT SUCCESSFUL! Your app is working on Railway.")
+            print("\n💡 Next steps:")
+            print("   1. Test user registration and login")
+            print("   2. Test vocabulary learning features")
+            print("   3. Consider adding gunicorn for production performance")
+        elif passed_tests > 0:
+            print("⚠️  PARTIAL SUCCESS: Some features work, but not all.")
+            print("   Check Railway logs for more details: railway logs")
+        else:
+            print("❌ DEPLOYMENT FAILED: No endpoints are working.")
+            print("   Check Railway logs: railway logs --tail 50")
 
-    if passed_tests == total_tests:
-        print("🎉 DEPLOYMENT SUCCESSFUL! Your app is working on Railway.")
-        print("\n💡 Next steps:")
-        print("   1. Test user registration and login")
-        print("   2. Test vocabulary learning features")
-        print("   3. Consider adding gunicorn for production performance")
-    elif passed_tests > 0:
-        print("⚠️  PARTIAL SUCCESS: Some features work, but not all.")
-        print("   Check Railway logs for more details: railway logs")
-    else:
-        print("❌ DEPLOYMENT FAILED: No endpoints are working.")
-        print("   Check Railway logs: railway logs --tail 50")
+        print(f"\n🕐 Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    print(f"\n🕐 Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # Machine-readable summary as the final stdout line, in one write
+    summary = {
+        "url": url,
+        "tests": [{"name": test_name, "passed": bool(result)} for (test_name, _), result in zip(tests, results)],
+        "passed": passed_tests,
+        "total": total_tests,
+    }
+    sys.stdout.write(json.dumps(summary, separators=(',', ':')) + "\n")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main(verbose="--verbose" in sys.argv[1:]))
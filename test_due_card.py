@@ -0,0 +1,38 @@
+# test_due_card.py - DueCard harus cocok dengan kolom query get_due_vocab
+import sqlite3
+from datetime import date
+
+from srs_algorithm import DueCard, SRSAlgorithm, _SQL_DUE_CARDS_PG, _SQL_DUE_CARDS_SQLITE
+
+SCHEMA = '''
+    CREATE TABLE vocabulary (id INTEGER PRIMARY KEY, english_word TEXT, indonesian_meaning TEXT,
+                             part_of_speech TEXT, example_sentence TEXT, difficulty_score FLOAT);
+    CREATE TABLE review_sessions (id INTEGER PRIMARY KEY, user_id INTEGER, vocab_id INTEGER,
+                                  next_review_date TEXT, ease_factor FLOAT, interval_days INTEGER,
+                                  repetition_count INTEGER);
+    INSERT INTO vocabulary VALUES (7, 'apple', 'apel', 'noun', 'An apple a day.', 1.5);
+    INSERT INTO review_sessions VALUES (1, 1, 7, '2000-01-01', 2.5, 6, 2);
+'''
+
+def make_conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    return conn
+
+def test_due_card_fields_match_cursor_description():
+    conn = make_conn()
+    today = date.today().isoformat()
+    cursor = conn.execute(_SQL_DUE_CARDS_SQLITE, (1, today, today))
+    assert tuple(column[0] for column in cursor.description) == DueCard._fields
+    conn.close()
+
+def test_pg_query_selects_same_columns():
+    # Versi PostgreSQL hanya beda placeholder, jadi kolomnya pasti sama
+    assert _SQL_DUE_CARDS_PG.replace('%s', '?') == _SQL_DUE_CARDS_SQLITE
+
+def test_get_due_vocab_returns_due_cards():
+    conn = make_conn()
+    cards = SRSAlgorithm().get_due_vocab(1, conn)
+    assert cards == [DueCard(7, 'apple', 'apel', 'noun', 'An apple a day.', 1.5, '2000-01-01', 2.5, 6, 2)]
+    assert cards[0].vocab_id == 7
+    conn.close()
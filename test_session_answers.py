@@ -0,0 +1,77 @@
+# test_session_answers.py - Tes simpan jawaban bulk (/api/session/answers/bulk)
+import sqlite3
+
+import pytest
+
+from db_init import init_database
+from session_answers import save_answers_bulk, validate_bulk_answers
+
+SESSION_TOKEN = 'session_test_bulk'
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    init_database(conn, 'sqlite')
+    conn.execute(
+        "INSERT INTO learning_sessions (session_token, start_time) VALUES (?, '2024-01-01 00:00:00')",
+        (SESSION_TOKEN,),
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+def make_answers(word_ids):
+    return [{
+        'word_id': word_id,
+        'user_answer': f'jawaban{i}',
+        'correct': i % 3 != 0,
+        'response_time': 1.0 + i,
+    } for i, word_id in enumerate(word_ids)]
+
+def saved(conn):
+    return conn.execute(
+        'SELECT session_token, word_id, user_answer, correct, response_time FROM user_answers ORDER BY id'
+    ).fetchall()
+
+def test_save_answers_bulk_inserts_all_rows_in_order(conn):
+    word_ids = [row[0] for row in conn.execute('SELECT id FROM words ORDER BY id LIMIT 5')]
+    # word_id yang sama boleh muncul lebih dari sekali dalam satu sesi
+    answers = make_answers(word_ids + word_ids[:2])
+
+    count, error = save_answers_bulk(conn.cursor(), SESSION_TOKEN, answers)
+
+    assert (count, error) == (len(answers), None)
+    assert saved(conn) == [
+        (SESSION_TOKEN, a['word_id'], a['user_answer'], int(a['correct']), a['response_time'])
+        for a in answers
+    ]
+
+def test_save_answers_bulk_rejects_unknown_session(conn):
+    word_id = conn.execute('SELECT id FROM words LIMIT 1').fetchone()[0]
+    assert save_answers_bulk(conn.cursor(), 'no_such_session', make_answers([word_id])) == (0, "Invalid session_token")
+    assert saved(conn) == []
+
+def test_save_answers_bulk_rejects_unknown_word(conn):
+    word_id = conn.execute('SELECT id FROM words LIMIT 1').fetchone()[0]
+    missing_id = conn.execute('SELECT MAX(id) + 1 FROM words').fetchone()[0]
+    answers = make_answers([word_id, missing_id])
+    assert save_answers_bulk(conn.cursor(), SESSION_TOKEN, answers) == (0, "Invalid word_id")
+    # Tidak ada jawaban yang tersimpan sebagian
+    assert saved(conn) == []
+
+@pytest.mark.parametrize('data, error', [
+    (None, "Expected session_token and a non-empty answers list"),
+    ({'answers': make_answers([1])}, "Expected session_token and a non-empty answers list"),
+    ({'session_token': SESSION_TOKEN, 'answers': []}, "Expected session_token and a non-empty answers list"),
+    ({'session_token': SESSION_TOKEN, 'answers': {'word_id': 1}}, "Expected session_token and a non-empty answers list"),
+    ({'session_token': SESSION_TOKEN, 'answers': make_answers([1]) + [{'word_id': 2, 'user_answer': 'x', 'correct': True}]},
+     "Missing field in answer 1: response_time"),
+    ({'session_token': SESSION_TOKEN, 'answers': [1]}, "Answer 0 must be an object"),
+    ({'session_token': SESSION_TOKEN, 'answers': make_answers([1]) + ['abc']}, "Answer 1 must be an object"),
+    ({'session_token': SESSION_TOKEN, 'answers': [None]}, "Answer 0 must be an object"),
+])
+def test_validate_bulk_answers_rejects(data, error):
+    assert validate_bulk_answers(data) == error
+
+def test_validate_bulk_answers_accepts():
+    assert validate_bulk_answers({'session_token': SESSION_TOKEN, 'answers': make_answers([1, 2])}) is None
@@ -1,17 +1,80 @@
-import requests
+import asyncio
+import httpx
 import time
 import sqlite3
 
 BASE_URL = 'http://localhost:5000'
 
+# Koneksi verifikasi dibuka sekali per modul dan dipakai ulang oleh semua query cek
+_verify_conn = None
+
+def get_verify_conn():
+    global _verify_conn
+    if _verify_conn is None:
+        _verify_conn = sqlite3.connect('srs_vocab.db', isolation_level=None, check_same_thread=False)
+        # Hanya baca; mmap mengurangi syscall read() untuk halaman database
+        _verify_conn.execute('PRAGMA query_only=1')
+        _verify_conn.execute('PRAGMA mmap_size=268435456')
+    return _verify_conn
+
+# Satu pool koneksi keep-alive untuk semua request dalam satu sesi tes
+HTTP_LIMITS = httpx.Limits(max_connections=16, keepalive_expiry=30)
+
+async def post_all(client, path, payloads):
+    """POST semua payload sekaligus; hasil urut sesuai payloads"""
+    return await asyncio.gather(*(client.post(f'{BASE_URL}{path}', json=payload) for payload in payloads))
+
+async def run_session(session_token, answers):
+    async with httpx.AsyncClient(limits=HTTP_LIMITS) as client:
+        # Start session
+        start_response = await client.post(f'{BASE_URL}/api/session-start', json={
+            'token': session_token,
+            'start_time': time.time() * 1000  # milliseconds
+        })
+        print(f'Session start: {start_response.status_code}')
+
+        # Semua jawaban dikirim paralel
+        responses = await post_all(client, '/api/submit-answer', [{
+            'word_id': ans['word_id'],
+            'user_answer': ans['user_answer'],
+            'response_time': 1.0
+        } for ans in answers])
+        for i, (ans, response) in enumerate(zip(answers, responses)):
+            print(f'Answer {i+1}: {response.status_code} - Correct: {ans["correct"]}')
+
+        # Complete session (this should trigger the updated completeSession logic)
+        # But since it's frontend, we need to simulate the POST to /api/session/complete
+        # The frontend now sends this data
+        total_questions = len(answers)
+        correct_answers = sum(1 for a in answers if a['correct'])
+        accuracy = (correct_answers / total_questions) * 100
+
+        complete_response = await client.post(f'{BASE_URL}/api/session/complete', json={
+            'session_token': session_token,
+            'end_time': time.time() * 1000,
+            'total_questions': total_questions,
+            'correct_answers': correct_answers,
+            'accuracy_rate': accuracy
+        })
+        print(f'Session complete: {complete_response.status_code}')
+
+        # Save answers (simulate saveAllAnswers): satu request bulk, satu executemany di server.
+        # answered_at = satu timestamp dasar + offset per jawaban (urutan deterministik)
+        base_ms = int(time.time() * 1000)
+        save_response = await client.post(f'{BASE_URL}/api/session/answers/bulk', json={
+            'session_token': session_token,
+            'answers': [{
+                'word_id': ans['word_id'],
+                'user_answer': ans['user_answer'],
+                'correct': ans['correct'],
+                'response_time': 1.0,
+                'answered_at': base_ms + i
+            } for i, ans in enumerate(answers)]
+        })
+        print(f'Answers saved: {save_response.status_code}')
+
 def test_session_completion():
-    # Start session
     session_token = f'session_test_{int(time.time())}'
-    start_response = requests.post(f'{BASE_URL}/api/session-start', json={
-        'token': session_token,
-        'start_time': time.time() * 1000  # milliseconds
-    })
-    print(f'Session start: {start_response.status_code}')
 
     # Simulate 10 answers (5 correct, 5 wrong for edge case)
     answers = [
@@ -27,44 +90,10 @@ def test_session_completion():
         {'word_id': 10, 'user_answer': 'paling murni', 'correct': True} # correct
     ]
 
-    for i, ans in enumerate(answers):
-        response = requests.post(f'{BASE_URL}/api/submit-answer', json={
-            'word_id': ans['word_id'],
-            'user_answer': ans['user_answer'],
-            'response_time': 1.0
-        })
-        print(f'Answer {i+1}: {response.status_code} - Correct: {ans["correct"]}')
-
-    # Complete session (this should trigger the updated completeSession logic)
-    # But since it's frontend, we need to simulate the POST to /api/session/complete
-    # The frontend now sends this data
-    total_questions = len(answers)
-    correct_answers = sum(1 for a in answers if a['correct'])
-    accuracy = (correct_answers / total_questions) * 100
-
-    complete_response = requests.post(f'{BASE_URL}/api/session/complete', json={
-        'session_token': session_token,
-        'end_time': time.time() * 1000,
-        'total_questions': total_questions,
-        'correct_answers': correct_answers,
-        'accuracy_rate': accuracy
-    })
-    print(f'Session complete: {complete_response.status_code}')
-
-    # Save answers (simulate saveAllAnswers)
-    for ans in answers:
-        requests.post(f'{BASE_URL}/api/session/answer', json={
-            'session_token': session_token,
-            'word_id': ans['word_id'],
-            'user_answer': ans['user_answer'],
-            'correct': ans['correct'],
-            'response_time': 1.0,
-            'answered_at': time.time() * 1000
-        })
+    asyncio.run(run_session(session_token, answers))
 
     # Check database
-    conn = sqlite3.connect('srs_vocab.db')
-    cursor = conn.cursor()
+    cursor = get_verify_conn().cursor()
 
     # Test 1: Session completion data
     cursor.execute('''
@@ -76,99 +105,11 @@ def test_session_completion():
     print(f'Session data: {session_data}')
 
     # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = %s
-    ''' if db_adapter.is_postgresql else '''
-        SELECT total_questions, correct_answers, accuracy_rate
-        FROM learning_sessions
-        ORDER BY id DESC LIMIT 1
-    ''')
-    session_data = cursor.fetchone()
-    print(f'Session data: {session_data}')
-
-    # Test 2: Answers saved
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_answers
-        WHERE session_token = ?
-    ''', (session_token,))
-    answer_count = cursor.fetchone()[0]
+    answer_count = cursor.execute(
+        'SELECT COUNT(*) FROM user_answers WHERE session_token = ?', (session_token,)
+    ).fetchone()[0]
     print(f'Answer count: {answer_count}')
 
-    conn.close()
-
     # Assertions
     assert session_data[0] == 10, f"total_questions should be 10, got {session_data[0]}"
     assert session_data[1] == 7, f"correct_answers should be 7, got {session_data[1]}"
@@ -0,0 +1,19 @@
+# test_srs_algorithm.py - Validasi input SM-2 legacy di srs_algorithm.py
+import pytest
+
+from srs_algorithm import SRSAlgorithm
+
+@pytest.mark.parametrize('quality', [-1, 6])
+def test_legacy_sm2_rejects_out_of_range_quality(quality):
+    srs = SRSAlgorithm()
+    cached = SRSAlgorithm._sm2_math.cache_info().currsize
+    with pytest.raises(ValueError):
+        srs.calculate_next_review_legacy(quality, 1, 2.5, 0)
+    # Input tidak valid ditolak sebelum _sm2_math, jadi tidak masuk cache
+    assert SRSAlgorithm._sm2_math.cache_info().currsize == cached
+
+def test_legacy_sm2_accepts_full_range():
+    srs = SRSAlgorithm()
+    eases = [srs.calculate_next_review_legacy(q, 6, 2.5, 2)['new_ease'] for q in range(6)]
+    assert eases == sorted(eases)
+    assert eases[5] == pytest.approx(2.6)
@@ -1,31 +1,45 @@
-import sqlite3
+import os
+import sys
+
+# Helper koneksi SQLite bersama (db.get_conn) ada di frontend/backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'backend'))
+from db import get_conn
+
+# Kolom yang bisa ditambahkan otomatis: nama -> definisi untuk ALTER TABLE ... ADD COLUMN
+ADDABLE_COLUMNS = {
+    'answered_at': 'DATETIME DEFAULT CURRENT_TIMESTAMP',
+}
 
 def update_schema():
-    conn = sqlite3.connect('srs_vocab.db')
+    conn = get_conn('srs_vocab.db')
     cursor = conn.cursor()
 
     print("🔧 Updating database schema...")
 
+    # Cek struktur dan ALTER dalam satu transaksi: worker lain tidak bisa mengubah
+    # tabel di antaranya, dan semua perubahan cukup satu commit (satu fsync)
+    cursor.execute("BEGIN IMMEDIATE")
+
     # 1. CEK STRUKTUR SAAT INI
     cursor.execute("PRAGMA table_info(user_answers)")
     columns = [col[1] for col in cursor.fetchall()]
     print("Current columns in user_answers:", columns)
 
-    # 2. TAMBAHKAN KOLOM JIKA BELUM ADA
-    if 'answered_at' not in columns:
-        print("➕ Adding 'answered_at' column to user_answers...")
-        cursor.execute('''
-            ALTER TABLE user_answers
-            ADD COLUMN answered_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        ''')
+    # 2. TAMBAHKAN KOLOM JIKA BELUM ADA (semua ALTER di transaksi yang sama)
+    missing_ddl = [
+        (col, ddl) for col, ddl in ADDABLE_COLUMNS.items() if col not in columns
+    ]
+    for col, ddl in missing_ddl:
+        print(f"➕ Adding '{col}' column to user_answers...")
+        cursor.execute(f"ALTER TABLE user_answers ADD COLUMN {col} {ddl}")
         print("✅ Column added")
-    else:
-        print("✅ Column 'answered_at' already exists")
+    for col in ADDABLE_COLUMNS.keys() & set(columns):
+        print(f"✅ Column '{col}' already exists")
 
     # 3. CEK KOLOM LAIN YANG MUNGKIN HILANG
     required_columns = ['session_token', 'word_id', 'user_answer', 'correct', 'response_time', 'answered_at']
     for col in required_columns:
-        if col not in columns and col != 'answered_at':
+        if col not in columns and col not in ADDABLE_COLUMNS:
             print(f"⚠️  Missing column: {col}")
 
     conn.commit()